@@ -0,0 +1,246 @@
+import json
+import logging
+import os
+
+from logging_setup import capture_payloads
+
+logger = logging.getLogger(__name__)
+
+# openai and pypdf are heavy to import, so they are only loaded on first use
+
+KNOWN_SKILLS = "API Testing, AWS, Accounting Principles, Agile Methodologies, Analytical Thinking, Analytics, Attention to Detail, Azure, Business Analysis, CI/CD, CRM (Salesforce), Cloud Architecture, Communication, Conflict Resolution, Content Strategy, Creativity, Data Visualization, Deep Learning, Digital Marketing, Docker, Editing, Empathy, Employee Relations, Excel, Figma, Financial Modeling, Git, HR Systems, HTML/CSS, Incident Response, Interaction Design, JavaScript, Jira, Kubernetes, Leadership, Linux, Machine Learning, Microservices, Negotiation, Network Security, Node.js, Organizational Skills, Pandas, Penetration Testing, Persuasion, Prioritization, Problem Solving, Product Strategy, Project Management, Prototyping, PyTorch, Python, REST API Design, REST API Integration, React, Recruitment, Relationship Building, Requirements Gathering, Research, Responsive Design, SEO, SQL, Sales Techniques, Security, Selenium, Social Media Marketing, Stakeholder Management, Statistics, Swift, SwiftUI, Tableau, TensorFlow, Terraform, Test Automation, Time Management, Troubleshooting, TypeScript, UIKit, User Research, Visual Design, Wireshark, Writing, Xcode, iOS SDK"
+
+CV_ANALYSIS_PROMPT = """
+        You are an expert HR AI and Career Coach for the "MagentaShift" platform. 
+        Your goal is to analyze a candidate's CV and extract a structured RPG-style skill profile.
+        
+        You must:
+        1. Calculate a "Creativity Score" (0.0-1.0) based on the uniqueness of their background, presentation, and language used. THIS IS MANDATORY.
+        2. Assign an "RPG Class" (e.g., "Code Wizard", "Data Alchemist", "Corporate Paladin", "Agile Bard", "Digital Strategist") based on their dominant skills.
+        3. Identify "Meta Skills" (high-level traits like "Leadership", "Adaptability", "Strategic Thinking").
+        4. Extract a COMPREHENSIVE list of skills (aim for 30-40 skills) to populate a rich skill tree.
+        
+        CRITICAL: PRIORITIZE MATCHING SKILLS FROM THIS MARKET LIST:
+        [{known_skills_str}]
+        
+        INSTRUCTIONS FOR SKILL EXTRACTION:
+        - If the candidate has a skill that is similar to one in this list, USE THE NAME FROM THE LIST.
+        - **INFER SKILLS**: If a candidate mentions "built a React app", you MUST infer and list "React", "JavaScript", "HTML", "CSS", and "Frontend Development" even if not explicitly listed.
+        - **BE AGGRESSIVE**: If they have "Senior Java Dev" role, assume they know "Java", "Spring Boot", "SQL", "Git", "CI/CD" unless proven otherwise.
+        - Be GENEROUS with matching. If they mention "managing projects", map it to "Project Management".
+        - Also extract other valid skills not in this list.
+        
+        For each skill, provide:
+           - A unique ID (use format: skill_<lowercase_name_with_underscores>)
+           - Name: The display name of the skill (in English)
+           - Type: "technical", "soft", "domain", or "tool"
+           - Category: EXACTLY ONE OF: "Code", "Data", "Social", "Business", "Design"
+           - Level: "basic", "intermediate", or "advanced" based on evidence
+           - Transferability Score (0.0-1.0): How applicable this skill is across different roles
+           - Evidence: Direct snippets from the CV that demonstrate this skill
+           - Reasoning: A brief explanation (1 sentence) of why this skill was extracted and its relevance.
+           - YearsOfExperience: Estimated years of experience with this skill (e.g., "2 years", "5+ years", "Unknown").
+           - ConnectionToPreviousJobs: Mention which role/company this skill was primarily used in (e.g., "Used as Backend Dev at Google").
+        
+        IMPORTANT RULES:
+        - Analyze CVs in ANY language (German, French, Spanish, Slovak, etc.) but ALWAYS output the skill names, reasoning, and descriptions in ENGLISH.
+        - Categories:
+            - "Code": Programming languages, frameworks, dev tools (e.g., Python, React, Git, AWS)
+            - "Data": SQL, Excel, Analytics, Visualization, Machine Learning (e.g., Tableau, Pandas)
+            - "Social": Communication, Leadership, Teamwork, Agile, Scrum
+            - "Business": Finance, Marketing, Strategy, Project Management, Sales
+            - "Design": UI/UX, Figma, Photoshop, Creative Writing
+        
+        Output strictly valid JSON with this exact schema:
+        {
+            "skills": [
+                {
+                    "id": "skill_python",
+                    "name": "Python",
+                    "type": "technical",
+                    "category": "Code",
+                    "level": "advanced",
+                    "transferabilityScore": 0.65,
+                    "evidence": [{"snippet": "5 years of Python development experience"}],
+                    "reasoning": "Candidate has extensive experience building backend systems with Python.",
+                    "yearsOfExperience": "5 years",
+                    "connectionToPreviousJobs": "Senior Developer at TechCorp"
+                }
+            ],
+            "creativityScore": 0.75,
+            "rpgClass": "Code Wizard",
+            "metaSkills": ["Problem Solving", "Team Collaboration"]
+        }
+        """.replace("{known_skills_str}", KNOWN_SKILLS)
+
+CHAT_REEVALUATION_PROMPT = """
+        You are an expert Career Coach. Based on the candidate's original skills and this chat conversation, 
+        RE-EVALUATE their profile. 
+        
+        If they want to change domains, identify transferrable skills and new potential skills they might have mentioned.
+        If they are staying, refine the skill levels and add any missing specific skills.
+        
+        Output JSON with:
+        - "skills": [Updated list of skills]
+        - "rpgClass": [Updated Class]
+        - "creativityScore": [Updated Score]
+        - "summary": [Brief updated summary]
+        """
+
+CHAT_FOLLOWUP_PROMPT = """
+        You are a friendly Career Coach running a short assessment chat. Your goal is to identify the candidate's specific strengths that would fit well with available roles in the market.
+        
+        You get a summary of the candidate's profile. Ask one follow-up question that:
+        1. Digs deeper into their specific skills and preferences.
+        2. Tries to uncover strengths relevant to potential next roles (e.g., leadership, specialized tech, creative problem solving).
+        3. Keeps the tone encouraging and professional.
+        
+        The question is reused for candidates with the same profile summary, so do not address the candidate by name or refer to earlier answers.
+        Keep your response short (under 2 sentences).
+        """
+
+_client = None
+_async_client = None
+_pdf_reader_cls = None
+
+def get_client():
+    """Shared OpenAI client, created on first use"""
+    global _client
+    if _client is None:
+        from openai import OpenAI
+        _client = OpenAI(api_key=require_api_key())
+    return _client
+
+def get_async_client():
+    """Shared AsyncOpenAI client so concurrent requests reuse one connection pool"""
+    global _async_client
+    if _async_client is None:
+        from openai import AsyncOpenAI
+        _async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _async_client
+
+def get_pdf_reader():
+    """pypdf.PdfReader, imported on the first upload instead of at startup"""
+    global _pdf_reader_cls
+    if _pdf_reader_cls is None:
+        from pypdf import PdfReader
+        _pdf_reader_cls = PdfReader
+    return _pdf_reader_cls
+
+def require_api_key():
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY not found. Please add your API key to backend/.env file")
+    return api_key
+
+class AIService:
+    @staticmethod
+    def extract_text_from_pdf(file_storage):
+        try:
+            reader = get_pdf_reader()(file_storage)
+            text = ""
+            for i, page in enumerate(reader.pages):
+                try:
+                    page_text = page.extract_text()
+                    if page_text:
+                        text += page_text + "\n"
+                    else:
+                        logger.warning("PDF page extraction returned no text", extra={"page": i})
+                except Exception as e:
+                    logger.error("Failed to extract text from PDF page", extra={"page": i, "error": str(e)})
+                    continue
+            
+            logger.info("PDF parsed", extra={"pages": len(reader.pages), "chars": len(text)})
+            if capture_payloads():
+                logger.info("Extracted PDF text", extra={"text": text})
+            
+            return text
+        except Exception as e:
+            logger.error("Critical PDF parsing error", extra={"error": str(e)})
+            raise ValueError(f"Failed to parse PDF file: {str(e)}")
+
+    @staticmethod
+    def scrub_pii(text):
+        """Remove emails and phone numbers from text"""
+        import re
+        
+        # Email regex
+        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+        text = re.sub(email_pattern, '[REDACTED_EMAIL]', text)
+        
+        # Phone regex (simple version for international/local formats)
+        # Matches patterns like +421 900 000 000, 0900 000 000, 0900-000-000
+        phone_pattern = r'\b(?:\+\d{1,3}[- ]?)?\(?\d{3}\)?[- ]?\d{3}[- ]?\d{3,4}\b'
+        text = re.sub(phone_pattern, '[REDACTED_PHONE]', text)
+        
+        return text
+
+    @staticmethod
+    def _cv_request(text):
+        """Build the chat.completions kwargs for a CV analysis"""
+        # Scrub PII before sending to AI
+        scrubbed_text = AIService.scrub_pii(text)
+        
+        logger.info("Sending scrubbed text to AI", extra={"chars": len(scrubbed_text)})
+        
+        user_content = f"CV Text:\n{scrubbed_text}\n"
+        return {
+            "model": "gpt-4o", # Using GPT-4 for best results
+            "messages": [
+                {"role": "system", "content": CV_ANALYSIS_PROMPT},
+                {"role": "user", "content": user_content}
+            ],
+            "response_format": {"type": "json_object"},
+            "temperature": 0.7 # Allow some creativity in skill extraction
+        }
+
+    @staticmethod
+    def _parse_cv_response(result_content):
+        logger.info("AI response received", extra={"chars": len(result_content or '')})
+        if capture_payloads():
+            logger.info("AI response", extra={"payload": result_content})
+        
+        result = json.loads(result_content)
+        
+        # Validate that we have the required fields
+        if not all(k in result for k in ["skills", "creativityScore", "rpgClass", "metaSkills"]):
+            raise ValueError("AI response missing required fields")
+        
+        return result
+
+    @staticmethod
+    def analyze_cv(text):
+        require_api_key()
+        request_kwargs = AIService._cv_request(text)
+        
+        try:
+            response = get_client().chat.completions.create(**request_kwargs)
+            return AIService._parse_cv_response(response.choices[0].message.content)
+        except Exception as e:
+            logger.error("OpenAI Error", extra={"error": str(e)})
+            raise ValueError(f"Failed to analyze CV with AI: {str(e)}")
+
+    @staticmethod
+    async def analyze_cv_async(text):
+        """Non-blocking variant of analyze_cv used by the ASGI server (asgi.py)"""
+        require_api_key()
+        request_kwargs = AIService._cv_request(text)
+        
+        try:
+            response = await get_async_client().chat.completions.create(**request_kwargs)
+            return AIService._parse_cv_response(response.choices[0].message.content)
+        except Exception as e:
+            logger.error("OpenAI Error", extra={"error": str(e)})
+            raise ValueError(f"Failed to analyze CV with AI: {str(e)}")
+
+    @staticmethod
+    def complete(request_kwargs):
+        """Run a chat completion and return the reply text"""
+        response = get_client().chat.completions.create(**request_kwargs)
+        return response.choices[0].message.content
+
+    @staticmethod
+    async def complete_async(request_kwargs):
+        """Non-blocking variant of complete"""
+        response = await get_async_client().chat.completions.create(**request_kwargs)
+        return response.choices[0].message.content
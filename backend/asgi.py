@@ -0,0 +1,153 @@
+"""ASGI entrypoint: serves the LLM-bound endpoints natively async.
+
+Run with:  uvicorn asgi:application --port 5000
+
+/api/candidate/parse and /api/assessment/chat await non-blocking OpenAI calls, so
+one process can hold many pending requests. DB and PDF work runs on a thread pool
+inside a Flask app context. Every other route is served by the regular Flask app
+(wsgi.py) through a WSGI adapter, so routes and JSON contracts stay the same.
+"""
+import asyncio
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+
+from wsgi import app
+from ai_service import AIService
+from uploads import UploadError, upload_keys, previous_upload, remember_upload, coalesce_async
+from serialization import choose_encoding, compress, dumps_bytes, COMPRESS_MIN_SIZE
+from routes import (
+    get_user_from_header, read_parse_options, save_candidate_profile,
+    prepare_chat_turn, finish_chat_turn, chat_failure
+)
+
+# Blocking work (SQLAlchemy, pypdf) - sized independently of the number of pending LLM calls
+EXECUTOR = ThreadPoolExecutor(max_workers=int(os.getenv('ASGI_DB_WORKERS', '16')))
+
+def _in_app_context(fn, *args):
+    with app.app_context():
+        return fn(*args)
+
+async def run_blocking(fn, *args):
+    """Run fn(*args) on the executor inside a Flask app context"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(EXECUTOR, partial(_in_app_context, fn, *args))
+
+def json_response(request, content, status_code=200):
+    """Same encoding and compression as the Flask side (serialization.py)"""
+    body = dumps_bytes(content)
+    headers = {'Vary': 'Accept-Encoding'}
+    encoding = choose_encoding(request.headers.get('accept-encoding'))
+    if encoding and len(body) >= COMPRESS_MIN_SIZE:
+        body = compress(body, encoding)
+        headers['Content-Encoding'] = encoding
+    return Response(body, status_code=status_code, headers=headers, media_type='application/json')
+
+
+async def parse_candidate(request):
+    content_type = request.headers.get('content-type', '')
+    form, body = None, None
+    if content_type.startswith('multipart/form-data') or content_type.startswith('application/x-www-form-urlencoded'):
+        form = await request.form()
+    else:
+        body = await request.json()
+
+    cv_text = ""
+    upload = None
+    file = form.get('file') if form else None
+    if file is not None and not isinstance(file, str):
+        if file.filename != '':
+            upload = await file.read()
+    else:
+        data = form if form else body
+        cv_text = data.get('cvText', '')
+
+    linkedin_url, wants_domain_change = read_parse_options(form, body)
+
+    if not upload and not cv_text and not linkedin_url:
+        return json_response(request, {"error": "No CV text, file, or LinkedIn URL provided"}, status_code=400)
+
+    auth_header = request.headers.get('Authorization')
+    idempotency_key = request.headers.get('Idempotency-Key')
+
+    def lookup():
+        current_user = get_user_from_header(auth_header)
+        keys, content_hash = upload_keys(
+            current_user.public_id if current_user else None, idempotency_key,
+            upload if upload is not None else cv_text, linkedin_url, wants_domain_change
+        )
+        return keys, content_hash, previous_upload(keys)
+
+    keys, content_hash, previous = await run_blocking(lookup)
+    if previous:
+        return json_response(request, previous)
+
+    async def run():
+        text = cv_text
+        if upload is not None:
+            try:
+                text = await run_blocking(AIService.extract_text_from_pdf, io.BytesIO(upload))
+            except Exception as e:
+                raise UploadError({"error": f"Failed to parse PDF: {str(e)}"}, 400)
+
+        if not text and not linkedin_url:
+            raise UploadError({"error": "No CV text, file, or LinkedIn URL provided"}, 400)
+
+        try:
+            analysis = await AIService.analyze_cv_async(text)
+        except ValueError as e:
+            raise UploadError({"error": str(e)}, 400)
+        except Exception as e:
+            raise UploadError({"error": f"Unexpected error during analysis: {str(e)}"}, 500)
+
+        def save():
+            result = save_candidate_profile(get_user_from_header(auth_header), analysis, wants_domain_change)
+            remember_upload(keys, content_hash, result['candidateId'])
+            return result
+        return await run_blocking(save)
+
+    try:
+        return json_response(request, await coalesce_async(keys, run))
+    except UploadError as e:
+        return json_response(request, e.body, status_code=e.status)
+
+
+async def chat_assessment(request):
+    data = await request.json()
+
+    turn, error = await run_blocking(prepare_chat_turn, data.get('sessionId'), data.get('message'))
+    if error:
+        return json_response(request, error[0], status_code=error[1])
+
+    ai_reply = turn.get('reply')
+    if ai_reply is None:
+        try:
+            ai_reply = await AIService.complete_async(turn['request'])
+        except Exception as e:
+            ai_reply, error = chat_failure(turn, e)
+            if error:
+                return json_response(request, error[0], status_code=error[1])
+
+    body, status = await run_blocking(finish_chat_turn, turn, ai_reply)
+    return json_response(request, body, status_code=status)
+
+
+application = Starlette(
+    routes=[
+        Route('/api/candidate/parse', parse_candidate, methods=['POST']),
+        Route('/api/assessment/chat', chat_assessment, methods=['POST']),
+        # Everything else goes through the Flask app unchanged
+        Mount('/', app=WSGIMiddleware(app, workers=int(os.getenv('ASGI_WSGI_WORKERS', '10')))),
+    ],
+    middleware=[
+        Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])
+    ],
+)
@@ -0,0 +1,63 @@
+"""Recruiter-view match results (avatars), kept in the shared cache so all workers agree.
+
+Per job the cache holds a hash of candidateId -> avatar, so a build or re-score only writes
+its own candidate's field and concurrent updates never overwrite each other. A job's hash
+counts as listed once the full candidate scan has stored it (COMPLETE_FIELD).
+
+An avatarId encodes the candidate and job ("<candidateId>:<jobId>"), so detail views need
+no index lookup and keep working after the cached list is evicted or rebuilt.
+"""
+from cache import get_cache
+
+AVATAR_TTL = 24 * 3600
+COMPLETE_FIELD = '__complete__'
+
+def _job_key(job_id):
+    return get_cache().key('avatars', 'job', job_id)
+
+def avatar_id(candidate_id, job_id):
+    return f"{candidate_id}:{job_id}"
+
+def parse_avatar_id(avatar_id):
+    """(candidate_id, job_id) encoded in an avatarId, or (None, None)"""
+    candidate_id, _, job_id = avatar_id.partition(':')
+    if not candidate_id or not job_id:
+        return None, None
+    return candidate_id, job_id
+
+def get_job_avatars(job_id):
+    """Cached avatars of a job (None if the job has not been listed yet)"""
+    avatars = get_cache().hgetall(_job_key(job_id))
+    if not avatars.pop(COMPLETE_FIELD, None):
+        return None
+    return list(avatars.values())
+
+def has_candidate_avatar(job_id, candidate_id):
+    """Whether a job's hash holds an avatar of the candidate (listed or only built so far)"""
+    return get_cache().hget(_job_key(job_id), candidate_id) is not None
+
+def set_candidate_avatar(job_id, avatar):
+    """Store (or replace) one candidate's avatar for a job"""
+    get_cache().hset(_job_key(job_id), {avatar['candidateId']: avatar}, AVATAR_TTL)
+
+def remove_candidate_avatars(job_ids, candidate_ids):
+    """Drop the candidates' avatars from the given jobs, leaving other avatars cached"""
+    if candidate_ids:
+        for job_id in job_ids:
+            get_cache().hdel(_job_key(job_id), *candidate_ids)
+
+def get_or_build_job_avatars(job_id, builder):
+    """Cached avatars of a job, calling builder() once across workers on a miss"""
+    cache = get_cache()
+
+    def fill():
+        avatars = builder()
+        if not avatars:
+            return None # Don't cache empty lists, new candidates should show up on the next call
+        # Avatars stored by builds/re-scores meanwhile are newer than the scan's - keep those
+        stored = cache.hgetall(_job_key(job_id))
+        fresh = {a['candidateId']: a for a in avatars if a['candidateId'] not in stored}
+        cache.hset(_job_key(job_id), {**fresh, COMPLETE_FIELD: True}, AVATAR_TTL)
+        return get_job_avatars(job_id)
+
+    return cache.single_flight(_job_key(job_id), lambda: get_job_avatars(job_id), fill) or []
@@ -0,0 +1,291 @@
+"""Shared cache tier for jobs, profiles and match results.
+
+Every worker process sees the same entries. The backend is picked by CACHE_URL:
+  sqlite:///path/to/cache.db   (default: data/cache.db)
+  redis://host:6379/0          (anything speaking the redis-py API - get/set/delete/incr/hset/hget/...)
+
+Keys are versioned: bump(namespace) invalidates every key of that namespace at once.
+Hashes (hset/hget/hgetall) hold many small fields under one key, each updated on its own;
+they expire as a whole and are never dropped by size-bounded eviction.
+get_or_set() is single-flight, so concurrent misses on one key run the loader only once
+(per process via a lock, across processes via a short-lived lock entry).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from serialization import dumps_bytes
+
+# Bump when the structure of cached values changes
+SCHEMA_VERSION = 2
+KEY_PREFIX = 'ms'
+DEFAULT_TTL = 3600
+LOCK_TTL = 30
+LOCK_POLL_INTERVAL = 0.05
+
+
+class SQLiteBackend:
+    """Cross-process cache in a local SQLite file, with TTLs and size-bounded eviction"""
+
+    def __init__(self, path, max_entries=50000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._sets = 0
+        conn = self._conn()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL, created_at REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS ix_cache_created_at ON cache (created_at)')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache_hash ('
+            'key TEXT NOT NULL, field TEXT NOT NULL, value BLOB NOT NULL, expires_at REAL, PRIMARY KEY (key, field))'
+        )
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            'SELECT value FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)',
+            (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, value, ex=None, nx=False):
+        now = time.time()
+        expires_at = now + ex if ex else None
+        conn = self._conn()
+        if nx:
+            # Only take over an entry that is missing or expired
+            cursor = conn.execute(
+                'INSERT INTO cache (key, value, expires_at, created_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at, '
+                'created_at = excluded.created_at WHERE cache.expires_at IS NOT NULL AND cache.expires_at <= ?',
+                (key, value, expires_at, now, now)
+            )
+            return cursor.rowcount == 1
+        conn.execute(
+            'INSERT OR REPLACE INTO cache (key, value, expires_at, created_at) VALUES (?, ?, ?, ?)',
+            (key, value, expires_at, now)
+        )
+        self._sets += 1
+        if self._sets % 500 == 0:
+            self.evict()
+        return True
+
+    def delete(self, *keys):
+        if keys:
+            self._conn().execute(f"DELETE FROM cache WHERE key IN ({','.join('?' * len(keys))})", keys)
+
+    def incr(self, key):
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT value FROM cache WHERE key = ?', (key,)).fetchone()
+            value = int(row[0]) + 1 if row else 1
+            conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires_at, created_at) VALUES (?, ?, NULL, ?)',
+                (key, str(value).encode(), time.time())
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return value
+
+    def hget(self, name, key):
+        row = self._conn().execute(
+            'SELECT value FROM cache_hash WHERE key = ? AND field = ? AND (expires_at IS NULL OR expires_at > ?)',
+            (name, key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def hgetall(self, name):
+        rows = self._conn().execute(
+            'SELECT field, value FROM cache_hash WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)',
+            (name, time.time())
+        ).fetchall()
+        return dict(rows)
+
+    def hset(self, name, key=None, value=None, mapping=None):
+        items = dict(mapping or {})
+        if key is not None:
+            items[key] = value
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # An expired hash starts over instead of reviving its old fields
+            conn.execute('DELETE FROM cache_hash WHERE key = ? AND expires_at <= ?', (name, time.time()))
+            expires_at = conn.execute('SELECT MIN(expires_at) FROM cache_hash WHERE key = ?', (name,)).fetchone()[0]
+            conn.executemany(
+                'INSERT OR REPLACE INTO cache_hash (key, field, value, expires_at) VALUES (?, ?, ?, ?)',
+                [(name, field, item, expires_at) for field, item in items.items()]
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return len(items)
+
+    def hdel(self, name, *keys):
+        if keys:
+            self._conn().execute(
+                f"DELETE FROM cache_hash WHERE key = ? AND field IN ({','.join('?' * len(keys))})", (name, *keys)
+            )
+
+    def expire(self, name, seconds):
+        self._conn().execute('UPDATE cache_hash SET expires_at = ? WHERE key = ?', (time.time() + seconds, name))
+
+    def evict(self):
+        """Drop expired entries, then the oldest ones down to 90% of max_entries"""
+        conn = self._conn()
+        conn.execute('DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?', (time.time(),))
+        conn.execute('DELETE FROM cache_hash WHERE expires_at IS NOT NULL AND expires_at <= ?', (time.time(),))
+        count = conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+        if count > self.max_entries:
+            # Version counters never expire and must survive eviction
+            conn.execute(
+                'DELETE FROM cache WHERE key IN (SELECT key FROM cache WHERE expires_at IS NOT NULL '
+                'ORDER BY created_at LIMIT ?)',
+                (count - int(self.max_entries * 0.9),)
+            )
+
+
+class SharedCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _version_key(self, namespace):
+        return f'{KEY_PREFIX}:{SCHEMA_VERSION}:ns:{namespace}'
+
+    def namespace_version(self, namespace):
+        value = self.backend.get(self._version_key(namespace))
+        return int(value) if value is not None else 0
+
+    def bump(self, namespace):
+        """Invalidate every key of a namespace"""
+        return self.backend.incr(self._version_key(namespace))
+
+    def key(self, namespace, *parts):
+        """Versioned key for an entry of a namespace"""
+        return ':'.join([KEY_PREFIX, str(SCHEMA_VERSION), namespace,
+                         str(self.namespace_version(namespace)), *map(str, parts)])
+
+    def get(self, key):
+        raw = self.backend.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl=DEFAULT_TTL):
+        self.backend.set(key, dumps_bytes(value), ex=ttl)
+
+    def delete(self, *keys):
+        self.backend.delete(*keys)
+
+    def hget(self, key, field):
+        raw = self.backend.hget(key, field)
+        return json.loads(raw) if raw is not None else None
+
+    def hgetall(self, key):
+        """All fields of a hash as {field: value} (empty if missing or expired)"""
+        return {
+            field.decode('utf-8') if isinstance(field, bytes) else field: json.loads(raw)
+            for field, raw in self.backend.hgetall(key).items()
+        }
+
+    def hset(self, key, values, ttl=DEFAULT_TTL):
+        """Set some fields of a hash, leaving the others alone; (re)starts the hash's TTL"""
+        if values:
+            self.backend.hset(key, mapping={field: dumps_bytes(value) for field, value in values.items()})
+            self.backend.expire(key, ttl)
+
+    def hdel(self, key, *fields):
+        self.backend.hdel(key, *fields)
+
+    def acquire(self, name, ttl):
+        """Take a named lock shared by all processes until it expires; False if already held"""
+        return bool(self.backend.set(f'{KEY_PREFIX}:{SCHEMA_VERSION}:lock:{name}', b'1', ex=ttl, nx=True))
+
+    def _lock_for(self, key):
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def get_or_set(self, key, loader, ttl=DEFAULT_TTL):
+        """Cached value for key, calling loader() once on a miss. None results are not cached."""
+        def fill():
+            value = loader()
+            if value is not None:
+                self.set(key, value, ttl)
+            return value
+        return self.single_flight(key, lambda: self.get(key), fill)
+
+    def single_flight(self, key, lookup, fill):
+        """lookup(), or fill() if that returns None - run by one caller at a time across all processes.
+
+        fill() is expected to store what lookup() reads; waiting callers poll lookup() meanwhile.
+        """
+        value = lookup()
+        if value is not None:
+            return value
+
+        with self._lock_for(key):
+            # Another thread of this process may have filled it meanwhile
+            value = lookup()
+            if value is not None:
+                return value
+
+            lock_key = f'{key}:lock'
+            deadline = time.time() + LOCK_TTL
+            while not self.backend.set(lock_key, b'1', ex=LOCK_TTL, nx=True):
+                # Another process is loading - wait for its result rather than loading too
+                time.sleep(LOCK_POLL_INTERVAL)
+                value = lookup()
+                if value is not None:
+                    return value
+                if time.time() > deadline:
+                    break
+
+            try:
+                return fill()
+            finally:
+                self.backend.delete(lock_key)
+                with self._locks_guard:
+                    self._locks.pop(key, None)
+
+
+def create_backend(url):
+    if url.startswith('redis://') or url.startswith('rediss://'):
+        import redis
+        return redis.Redis.from_url(url)
+    if url.startswith('sqlite:///'):
+        return SQLiteBackend(url[len('sqlite:///'):])
+    raise ValueError(f"Unsupported CACHE_URL: {url}")
+
+_cache = None
+_cache_guard = threading.Lock()
+
+def get_cache():
+    """Process-wide SharedCache, configured from CACHE_URL on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_guard:
+            if _cache is None:
+                data_dir = os.path.join(os.path.dirname(__file__), 'data')
+                os.makedirs(data_dir, exist_ok=True)
+                default_url = f"sqlite:///{os.path.join(data_dir, 'cache.db')}"
+                _cache = SharedCache(create_backend(os.getenv('CACHE_URL', default_url)))
+    return _cache
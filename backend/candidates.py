@@ -0,0 +1,141 @@
+"""Memory-compact, scoring-only view of all candidate profiles.
+
+Scoring only needs to know which skills a candidate has, so each candidate is kept as a
+__slots__ record of interned integer skill ids and names. Levels, evidence, reasoning and
+the other verbose fields stay in the DB / profile cache (profiles.py) and are only loaded
+for detail views.
+
+The store lives in each process and is kept current incrementally:
+- new profiles are picked up by primary key (id > highest id loaded)
+- changed or deleted profiles are recorded in a change log in the shared cache
+  (note_candidate_changed), which every process replays
+"""
+import json
+import threading
+from array import array
+from bisect import bisect_left
+
+from cache import get_cache
+from models import CandidateProfile
+
+LOAD_BATCH_SIZE = 1000
+# More unseen changes than this (or an expired log entry) means a full reload
+MAX_REPLAY = 1000
+CHANGE_TTL = 24 * 3600
+
+
+class Vocabulary:
+    """Interns strings to small ints for this process"""
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+        self._guard = threading.Lock()
+
+    def intern(self, value):
+        key = self.ids.get(value)
+        if key is None:
+            with self._guard:
+                key = self.ids.get(value)
+                if key is None:
+                    key = self.ids[value] = len(self.values)
+                    self.values.append(value)
+        return key
+
+# Separate key spaces, like calculate_build's matching: ids only match ids, names only names
+SKILL_IDS = Vocabulary()
+SKILL_NAMES = Vocabulary()
+RPG_CLASSES = Vocabulary()
+
+
+def _contains(keys, key):
+    i = bisect_left(keys, key)
+    return i < len(keys) and keys[i] == key
+
+
+class CompactCandidate:
+    __slots__ = ('candidate_id', 'rpg_class', 'ids', 'names')
+
+    def __init__(self, candidate_id, rpg_class, skills):
+        self.candidate_id = candidate_id
+        self.rpg_class = RPG_CLASSES.intern(rpg_class or '')
+        # Sorted interned skill ids and lowercased names for matching (binary search)
+        self.ids = array('I', sorted({SKILL_IDS.intern(s['id']) for s in skills}))
+        self.names = array('I', sorted({SKILL_NAMES.intern(s['name'].lower()) for s in skills}))
+
+    def has_id(self, key):
+        return _contains(self.ids, key)
+
+    def has_name(self, key):
+        return _contains(self.names, key)
+
+    @property
+    def rpg_class_name(self):
+        return RPG_CLASSES.values[self.rpg_class] or None
+
+
+class CandidateStore:
+    def __init__(self):
+        self.by_id = {}
+        self._max_pk = 0
+        self._seen_change = None
+        self._guard = threading.Lock()
+
+    def _load_rows(self, query, track_pk=True):
+        for pk, candidate_id, rpg_class, skills_json in query.yield_per(LOAD_BATCH_SIZE):
+            skills = json.loads(skills_json) if skills_json else []
+            self.by_id[candidate_id] = CompactCandidate(candidate_id, rpg_class, skills)
+            if track_pk:
+                self._max_pk = max(self._max_pk, pk)
+
+    def _query(self):
+        return CandidateProfile.query.with_entities(
+            CandidateProfile.id, CandidateProfile.candidate_id, CandidateProfile.rpg_class, CandidateProfile.skills_json
+        ).order_by(CandidateProfile.id)
+
+    def _reload(self):
+        self.by_id = {}
+        self._max_pk = 0
+        self._load_rows(self._query())
+
+    def _replay_changes(self, latest):
+        cache = get_cache()
+        if self._seen_change is None or latest - self._seen_change > MAX_REPLAY:
+            return False
+        changed = []
+        for seq in range(self._seen_change + 1, latest + 1):
+            candidate_id = cache.get(cache.key('candidates', 'change', seq))
+            if candidate_id is None:
+                return False
+            changed.append(candidate_id)
+        for candidate_id in changed:
+            self.by_id.pop(candidate_id, None)
+        # Not tracked: a changed row may be newer than rows the id scan has not reached yet
+        self._load_rows(self._query().filter(CandidateProfile.candidate_id.in_(changed)), track_pk=False)
+        return True
+
+    def refresh(self):
+        """Bring the store up to date with the DB. Needs an app context."""
+        with self._guard:
+            latest = get_cache().namespace_version('candidate-changes')
+            if latest != self._seen_change and not self._replay_changes(latest):
+                self._reload()
+            # New profiles since the last refresh
+            self._load_rows(self._query().filter(CandidateProfile.id > self._max_pk))
+            self._seen_change = latest
+
+    def all(self, candidate_ids=None):
+        """Current compact candidates (all, or the given ids in that order)"""
+        self.refresh()
+        if candidate_ids is None:
+            return list(self.by_id.values())
+        return [self.by_id[c] for c in candidate_ids if c in self.by_id]
+
+STORE = CandidateStore()
+
+
+def note_candidate_changed(candidate_id):
+    """Record an updated/deleted profile so every process's store refreshes it"""
+    cache = get_cache()
+    seq = cache.bump('candidate-changes')
+    cache.set(cache.key('candidates', 'change', seq), candidate_id, CHANGE_TTL)
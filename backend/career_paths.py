@@ -0,0 +1,162 @@
+"""Job-to-job similarity index for career path suggestions.
+
+Jobs are compared on their weighted required-skill sets (weighted Jaccard, weights by
+importance). Each job gets a MinHash signature, split into LSH bands, so the roles adjacent
+to a job are found with a few indexed bucket lookups instead of comparing all pairs.
+
+The index lives in the JobSignature / JobBucket tables. seed_jobs rebuilds it incrementally:
+only jobs whose skill set changed are re-hashed. To rebuild by hand:  python career_paths.py
+"""
+import hashlib
+import json
+import random
+
+from sqlalchemy.orm import selectinload
+
+from models import db, Job, JobSignature, JobBucket
+from scoring import calculate_build
+
+# Integer weights make weighted Jaccard a plain Jaccard over repeated tokens
+IMPORTANCE_WEIGHTS = {'critical': 3, 'high': 2}
+DEFAULT_WEIGHT = 1
+
+NUM_PERM = 64
+# Two jobs become candidates if any band of 2 values matches. The S-curve threshold
+# (1/BANDS)^(1/ROWS) is ~0.18, just under similar_jobs' min_similarity of 0.2: pairs at 0.3
+# are found ~95% of the time (16x4 bands put it near 0.5 and missed most of them).
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+
+_PRIME = (1 << 61) - 1
+# Fixed seed: signatures must stay comparable across processes and rebuilds
+_rng = random.Random(20250101)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+
+def _hash64(text):
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def weighted_tokens(job):
+    """Required skills of a job as tokens, each repeated by its importance weight"""
+    tokens = set()
+    for skill in job.skills_required:
+        name = skill.name.lower()
+        for i in range(IMPORTANCE_WEIGHTS.get(skill.importance, DEFAULT_WEIGHT)):
+            tokens.add(f"{name}#{i}")
+    return sorted(tokens)
+
+def minhash(tokens):
+    hashes = [_hash64(t) for t in tokens]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+def band_buckets(signature):
+    """(band, bucket) pairs of a signature"""
+    return [
+        (band, hashlib.blake2b(
+            ','.join(map(str, signature[band * ROWS:(band + 1) * ROWS])).encode('utf-8'), digest_size=8
+        ).hexdigest())
+        for band in range(BANDS)
+    ]
+
+def estimate_similarity(sig_a, sig_b):
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERM
+
+
+def build_similarity_index(jobs=None):
+    """Bring the index up to date with the jobs table. Returns counts of what changed."""
+    if jobs is None:
+        jobs = Job.query.options(selectinload(Job.skills_required)).all()
+    existing = {s.job_id: s for s in JobSignature.query.all()}
+    stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+    seen = set()
+    for job in jobs:
+        seen.add(job.job_id)
+        tokens = weighted_tokens(job)
+        # Includes the banding, so changing it re-buckets every job on the next rebuild
+        content_hash = hashlib.blake2b(
+            '\n'.join([f"{NUM_PERM}x{BANDS}", *tokens]).encode('utf-8'), digest_size=16
+        ).hexdigest()
+        current = existing.get(job.job_id)
+        if current is not None and current.content_hash == content_hash:
+            stats["unchanged"] += 1
+            continue
+
+        signature = minhash(tokens) if tokens else []
+        if current is None:
+            db.session.add(JobSignature(job_id=job.job_id, content_hash=content_hash, signature=json.dumps(signature)))
+            stats["added"] += 1
+        else:
+            current.content_hash = content_hash
+            current.signature = json.dumps(signature)
+            stats["updated"] += 1
+
+        JobBucket.query.filter_by(job_id=job.job_id).delete()
+        # Jobs without skills would all share one bucket - they are never adjacent to anything
+        if signature:
+            db.session.add_all(
+                JobBucket(band=band, bucket=bucket, job_id=job.job_id) for band, bucket in band_buckets(signature)
+            )
+
+    removed = [job_id for job_id in existing if job_id not in seen]
+    if removed:
+        JobSignature.query.filter(JobSignature.job_id.in_(removed)).delete(synchronize_session=False)
+        JobBucket.query.filter(JobBucket.job_id.in_(removed)).delete(synchronize_session=False)
+        stats["removed"] = len(removed)
+
+    db.session.commit()
+    return stats
+
+
+def similar_jobs(job_id, min_similarity=0.2):
+    """[(job_id, estimated similarity)] of jobs sharing an LSH bucket with job_id, most similar first"""
+    source = JobSignature.query.get(job_id)
+    if not source:
+        return []
+    signature = json.loads(source.signature)
+    if not signature:
+        return []
+
+    buckets = band_buckets(signature)
+    matches = JobBucket.query.filter(
+        db.or_(*[db.and_(JobBucket.band == band, JobBucket.bucket == bucket) for band, bucket in buckets])
+    ).with_entities(JobBucket.job_id).distinct().all()
+    candidate_ids = [row[0] for row in matches if row[0] != job_id]
+    if not candidate_ids:
+        return []
+
+    result = []
+    for other in JobSignature.query.filter(JobSignature.job_id.in_(candidate_ids)).all():
+        similarity = estimate_similarity(signature, json.loads(other.signature))
+        if similarity >= min_similarity:
+            result.append((other.job_id, similarity))
+    result.sort(key=lambda item: item[1], reverse=True)
+    return result
+
+def adjacent_roles(candidate_profile, job_id, limit=5):
+    """Roles adjacent to job_id, ordered by the candidate's gap hours (smallest first)"""
+    similarities = dict(similar_jobs(job_id))
+    if not similarities:
+        return []
+
+    roles = []
+    for job in Job.query.filter(Job.job_id.in_(list(similarities))).all():
+        build_data = calculate_build(candidate_profile, job)
+        roles.append({
+            "jobId": job.job_id,
+            "jobTitle": job.title,
+            "domain": job.domain,
+            "similarity": round(similarities[job.job_id], 2),
+            "matchScore": build_data['matchScore'],
+            "gapCostHours": build_data['gapCostHours']
+        })
+    roles.sort(key=lambda r: (r['gapCostHours'], -r['similarity']))
+    return roles[:limit]
+
+
+if __name__ == '__main__':
+    from app import create_app, init_db
+    app = create_app()
+    init_db(app)
+    with app.app_context():
+        print(build_similarity_index())
@@ -0,0 +1,46 @@
+"""Check the cold-start budget: import time of the app entrypoints and lazy heavy modules.
+
+Usage:  python check_startup.py   (exit code 1 if over budget)
+Also run by the test suite (tests/test_startup.py).
+"""
+import os
+import subprocess
+import sys
+
+# Seconds, measured in a fresh interpreter
+IMPORT_BUDGET = float(os.getenv('IMPORT_BUDGET_SECONDS', '1.0'))
+
+# Must not be imported until a request actually needs them
+LAZY_MODULES = ['openai', 'pypdf', 'dotenv']
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(','.join(m for m in {lazy!r} if m in sys.modules))
+"""
+
+def measure(module):
+    """Return (seconds, eagerly imported heavy modules) for importing module"""
+    probe = PROBE.format(module=module, lazy=LAZY_MODULES)
+    out = subprocess.run(
+        [sys.executable, '-c', probe], cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True
+    ).stdout.split('\n')
+    return float(out[0]), [m for m in out[1].split(',') if m]
+
+def main():
+    failed = False
+    # routes is what every worker imports; models is all the seeder needs
+    for module in ['models', 'routes', 'app']:
+        seconds, eager = measure(module)
+        ok = seconds <= IMPORT_BUDGET and not eager
+        failed = failed or not ok
+        print(f"{'OK  ' if ok else 'FAIL'} import {module}: {seconds:.3f}s (budget {IMPORT_BUDGET}s)"
+              + (f", eagerly imported: {', '.join(eager)}" if eager else ""))
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
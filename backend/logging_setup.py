@@ -0,0 +1,115 @@
+"""Central logging configuration, applied once by create_app().
+
+Request threads only put records on a queue; a listener thread formats them as JSON lines
+and writes them to logs/app.log (rotated by size). Configured from the environment:
+
+  LOG_LEVEL              root level (default INFO)
+  LOG_LEVELS             per-logger levels, e.g. "ai_service=DEBUG,routes=WARNING"
+  LOG_SAMPLING           per-logger sampling of records below WARNING, e.g. "ai_service=0.1"
+  LOG_MAX_BYTES          rotate at this size (default 10MB), LOG_BACKUP_COUNT files kept (default 5)
+  LOG_CAPTURE_PAYLOADS   "1" to also log full CV texts and LLM responses (debugging only)
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+from datetime import datetime, timezone
+
+LOG_DIR = os.path.join(os.path.dirname(__file__), 'logs')
+
+# Attributes every LogRecord has - anything else was passed via extra= and is logged as a field
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting (and exc_info) to the listener's JsonFormatter"""
+
+    def prepare(self, record):
+        # The stock prepare() formats the record and drops exc_info; only resolve the
+        # message arguments here, which may change before the listener gets to them
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of a logger's records below WARNING"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+def _parse_pairs(value):
+    pairs = {}
+    for item in (value or '').split(','):
+        name, _, setting = item.partition('=')
+        if name.strip() and setting.strip():
+            pairs[name.strip()] = setting.strip()
+    return pairs
+
+def capture_payloads():
+    """Whether full CV texts / LLM payloads may be logged"""
+    return os.getenv('LOG_CAPTURE_PAYLOADS') == '1'
+
+def configure_logging():
+    """Install the queue handler on the root logger (only once per process)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    os.makedirs(LOG_DIR, exist_ok=True)
+    file_handler = logging.handlers.RotatingFileHandler(
+        os.path.join(LOG_DIR, 'app.log'),
+        maxBytes=int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024))),
+        backupCount=int(os.getenv('LOG_BACKUP_COUNT', '5')),
+        encoding='utf-8'
+    )
+    file_handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.addHandler(StructuredQueueHandler(log_queue))
+    root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+
+    for name, level in _parse_pairs(os.getenv('LOG_LEVELS')).items():
+        logging.getLogger(name).setLevel(level.upper())
+    for name, rate in _parse_pairs(os.getenv('LOG_SAMPLING')).items():
+        logging.getLogger(name).addFilter(SamplingFilter(float(rate)))
+
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+def shutdown_logging():
+    """Flush what is still queued and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,153 @@
+"""Periodic cleanup of abandoned data.
+
+- Assessment sessions with no activity for SESSION_TTL_HOURS are marked 'expired'.
+- Finished (completed/expired) sessions older than SESSION_RETENTION_DAYS are deleted.
+- Anonymous profiles older than PROFILE_RETENTION_DAYS with no active session are appended to
+  data/archive/profiles-YYYYMMDD.jsonl, deleted and dropped from cached recruiter lists.
+- SQLite gets ANALYZE, plus VACUUM when anything was deleted, and the cache file is evicted.
+
+The worker runs in the served process (see wsgi.py). Across workers a cache lock makes sure only
+one of them runs each interval. Run once by hand:  python maintenance.py
+"""
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+
+from avatars import remove_candidate_avatars
+from cache import get_cache, SQLiteBackend
+from models import db, CandidateProfile, AssessmentSession, Job
+from candidates import note_candidate_changed
+from profiles import invalidate_profile, profile_to_dict
+
+SESSION_TTL_HOURS = float(os.getenv('SESSION_TTL_HOURS', '24'))
+SESSION_RETENTION_DAYS = float(os.getenv('SESSION_RETENTION_DAYS', '30'))
+PROFILE_RETENTION_DAYS = float(os.getenv('PROFILE_RETENTION_DAYS', '30'))
+MAINTENANCE_INTERVAL = int(os.getenv('MAINTENANCE_INTERVAL_SECONDS', '3600'))
+
+ARCHIVE_DIR = os.path.join(os.path.dirname(__file__), 'data', 'archive')
+BATCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+
+def expire_sessions(now):
+    cutoff = now - timedelta(hours=SESSION_TTL_HOURS)
+    expired = AssessmentSession.query.filter(
+        AssessmentSession.status == 'active', AssessmentSession.updated_at < cutoff
+    ).update({AssessmentSession.status: 'expired'}, synchronize_session=False)
+    db.session.commit()
+    return expired
+
+def delete_old_sessions(now):
+    cutoff = now - timedelta(days=SESSION_RETENTION_DAYS)
+    deleted = AssessmentSession.query.filter(
+        AssessmentSession.status.in_(['completed', 'expired']), AssessmentSession.updated_at < cutoff
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+def archive_anonymous_profiles(now):
+    """Move old anonymous profiles to a JSONL archive. Returns how many were archived."""
+    cutoff = now - timedelta(days=PROFILE_RETENTION_DAYS)
+    active = db.select(AssessmentSession.candidate_id).where(AssessmentSession.status == 'active')
+    archived = 0
+    job_ids = None
+    while True:
+        batch = CandidateProfile.query.filter(
+            CandidateProfile.user_id.is_(None),
+            CandidateProfile.created_at < cutoff,
+            ~CandidateProfile.candidate_id.in_(active)
+        ).limit(BATCH_SIZE).all()
+        if not batch:
+            return archived
+
+        os.makedirs(ARCHIVE_DIR, exist_ok=True)
+        path = os.path.join(ARCHIVE_DIR, f"profiles-{now:%Y%m%d}.jsonl")
+        with open(path, 'a') as f:
+            for profile_record in batch:
+                record = profile_to_dict(profile_record)
+                record['createdAt'] = profile_record.created_at.isoformat() if profile_record.created_at else None
+                f.write(json.dumps(record) + '\n')
+
+        candidate_ids = [p.candidate_id for p in batch]
+        CandidateProfile.query.filter(CandidateProfile.candidate_id.in_(candidate_ids)).delete(synchronize_session=False)
+        db.session.commit()
+        # Bulk deletes skip the ORM events that normally invalidate these
+        for candidate_id in candidate_ids:
+            invalidate_profile(candidate_id)
+            note_candidate_changed(candidate_id)
+        # Recruiter lists keep their other candidates
+        if job_ids is None:
+            job_ids = [row[0] for row in Job.query.with_entities(Job.job_id).all()]
+        remove_candidate_avatars(job_ids, candidate_ids)
+        archived += len(batch)
+
+def optimize_sqlite(vacuum):
+    """ANALYZE (and VACUUM) the SQLite database; returns bytes reclaimed"""
+    engine = db.engine
+    if engine.dialect.name != 'sqlite':
+        return 0
+    path = engine.url.database
+    size_before = os.path.getsize(path) if path and os.path.exists(path) else 0
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        if vacuum:
+            conn.exec_driver_sql('VACUUM')
+        conn.exec_driver_sql('ANALYZE')
+    size_after = os.path.getsize(path) if path and os.path.exists(path) else 0
+    return max(size_before - size_after, 0)
+
+
+def run_maintenance():
+    """Run every maintenance step once and return a report. Needs an app context."""
+    now = datetime.utcnow()
+    report = {
+        "startedAt": now.isoformat(),
+        "sessionsExpired": expire_sessions(now),
+        "sessionsDeleted": delete_old_sessions(now),
+        "profilesArchived": archive_anonymous_profiles(now),
+    }
+    report["bytesReclaimed"] = optimize_sqlite(vacuum=bool(report["sessionsDeleted"] or report["profilesArchived"]))
+
+    backend = get_cache().backend
+    if isinstance(backend, SQLiteBackend):
+        backend.evict()
+
+    logger.info("Maintenance finished", extra=report)
+    return report
+
+_stop = threading.Event()
+
+def start_maintenance_worker(app, interval=MAINTENANCE_INTERVAL):
+    """Run maintenance every interval seconds in a daemon thread (interval <= 0 disables it)"""
+    if interval <= 0:
+        return None
+
+    _stop.clear()
+    def loop():
+        while not _stop.wait(interval):
+            # Only one worker process per interval
+            if not get_cache().acquire('maintenance', interval):
+                continue
+            try:
+                with app.app_context():
+                    run_maintenance()
+            except Exception:
+                logger.exception("Maintenance run failed")
+
+    thread = threading.Thread(target=loop, name='maintenance', daemon=True)
+    thread.start()
+    return thread
+
+def stop_maintenance_worker():
+    """Let the worker thread exit after its current run"""
+    _stop.set()
+
+
+if __name__ == '__main__':
+    from app import create_app, init_db
+    app = create_app()
+    init_db(app)
+    with app.app_context():
+        print(json.dumps(run_maintenance(), indent=2))
@@ -0,0 +1,71 @@
+from flask_sqlalchemy import SQLAlchemy
+from datetime import datetime
+
+# Bound to the app in create_app() (app.py)
+db = SQLAlchemy()
+
+# --- Database Models ---
+
+class User(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    public_id = db.Column(db.String(50), unique=True)
+    name = db.Column(db.String(100), nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password_hash = db.Column(db.String(128), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relationship to profile
+    profile = db.relationship('CandidateProfile', backref='user', uselist=False)
+
+class CandidateProfile(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), unique=True, nullable=True)
+    candidate_id = db.Column(db.String(50), unique=True, nullable=False) # UUID for frontend ref
+    rpg_class = db.Column(db.String(50))
+    creativity_score = db.Column(db.Float)
+    summary = db.Column(db.String(200))
+    skills_json = db.Column(db.Text) # Stored as JSON string
+    meta_skills_json = db.Column(db.Text) # Stored as JSON string
+    wants_domain_change = db.Column(db.Boolean, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class AssessmentSession(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    candidate_id = db.Column(db.String(50), nullable=False)
+    messages = db.Column(db.Text, default='[]') # JSON list of messages
+    status = db.Column(db.String(20), default='active') # active, completed
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class Job(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(50), unique=True, nullable=False)
+    title = db.Column(db.String(100), nullable=False)
+    domain = db.Column(db.String(50))
+    description = db.Column(db.String(500))
+    
+    # Relationship
+    skills_required = db.relationship('JobSkill', backref='job', lazy=True, cascade="all, delete-orphan")
+
+class JobSkill(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False)
+    skill_id = db.Column(db.String(50), nullable=False)
+    name = db.Column(db.String(100), nullable=False)
+    type = db.Column(db.String(50)) # technical, soft
+    importance = db.Column(db.String(20)) # critical, high, medium
+
+# --- Job similarity index (built offline by career_paths.build_similarity_index) ---
+
+class JobSignature(db.Model):
+    job_id = db.Column(db.String(50), primary_key=True) # Job.job_id
+    content_hash = db.Column(db.String(32), nullable=False) # Hash of the weighted skill set it was built from
+    signature = db.Column(db.Text, nullable=False) # JSON list of MinHash values
+
+class JobBucket(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    band = db.Column(db.Integer, nullable=False)
+    bucket = db.Column(db.String(16), nullable=False)
+    job_id = db.Column(db.String(50), nullable=False, index=True)
+    
+    __table_args__ = (db.Index('ix_job_bucket_band_bucket', 'band', 'bucket'),)
@@ -0,0 +1,65 @@
+import json
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from cache import get_cache
+from candidates import note_candidate_changed
+from models import CandidateProfile
+
+PROFILE_TTL = 3600
+
+def profile_to_dict(profile_record):
+    """Decode a CandidateProfile row into the profile structure used by the API"""
+    return {
+        "candidateId": profile_record.candidate_id,
+        "summary": profile_record.summary,
+        "skills": json.loads(profile_record.skills_json) if profile_record.skills_json else [],
+        "metaSkills": json.loads(profile_record.meta_skills_json) if profile_record.meta_skills_json else [],
+        "creativityScore": profile_record.creativity_score,
+        "rpgClass": profile_record.rpg_class,
+        "wantsDomainChange": profile_record.wants_domain_change
+    }
+
+def _profile_key(candidate_id):
+    return get_cache().key('profiles', candidate_id)
+
+def load_candidate_profile(candidate_id):
+    """Stored profile for a candidate (None if unknown), via the shared cache. Needs an app context."""
+    def load():
+        profile_record = CandidateProfile.query.filter_by(candidate_id=candidate_id).first()
+        return profile_to_dict(profile_record) if profile_record else None
+    return get_cache().get_or_set(_profile_key(candidate_id), load, PROFILE_TTL)
+
+def _source_key(candidate_id):
+    return get_cache().key('profile-sources', candidate_id)
+
+def profile_source(candidate_id):
+    """Content hash of the upload the profile was last built from (None if unknown or changed since)"""
+    return get_cache().get(_source_key(candidate_id))
+
+def set_profile_source(candidate_id, content_hash, ttl):
+    get_cache().set(_source_key(candidate_id), content_hash, ttl)
+
+def invalidate_profile(candidate_id):
+    # Any change also detaches the profile from the upload it was built from (uploads.py)
+    get_cache().delete(_profile_key(candidate_id), _source_key(candidate_id))
+
+@event.listens_for(CandidateProfile, 'after_update')
+@event.listens_for(CandidateProfile, 'after_delete')
+def _profile_changed(mapper, connection, target):
+    invalidate_profile(target.candidate_id)
+    # Another worker may re-read the old row before our commit lands - drop it again afterwards
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('changed_profiles', set()).add(target.candidate_id)
+
+@event.listens_for(Session, 'after_commit')
+def _drop_committed_profiles(session):
+    for candidate_id in session.info.pop('changed_profiles', ()):
+        invalidate_profile(candidate_id)
+        note_candidate_changed(candidate_id)
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_rolled_back_profiles(session):
+    session.info.pop('changed_profiles', None)
@@ -0,0 +1,73 @@
+"""Assessment chat questions, shared across candidates with similar profiles.
+
+The opening message is templated. Follow-up questions are generated from profile features
+only (rpg_class, top skills, domain-change flag, turn number), never from the candidate's
+answers, so one generated question can be cached and served to every candidate with the
+same features. The LLM is only called on a cache miss.
+"""
+import hashlib
+
+from ai_service import CHAT_FOLLOWUP_PROMPT
+from cache import get_cache
+
+QUESTION_TTL = 7 * 24 * 3600
+TOP_SKILLS = 3
+
+LEVEL_RANK = {'advanced': 0, 'intermediate': 1, 'basic': 2}
+
+# Served if the LLM call for a missing question fails
+FALLBACK_QUESTIONS = [
+    "Which project are you proudest of, and what was your part in it?",
+    "What kind of team or role would you like to grow into next?",
+]
+
+def top_skills(profile):
+    """Names of the candidate's strongest skills (by level, then extraction order)"""
+    skills = sorted(profile.get('skills', []), key=lambda s: LEVEL_RANK.get(s.get('level'), len(LEVEL_RANK)))
+    return [s['name'] for s in skills[:TOP_SKILLS]]
+
+def opening_message(profile):
+    if profile.get('wantsDomainChange'):
+        return "I see you're interested in exploring a new domain! That's exciting. To help me find the best path for you, could you tell me a bit about what fields or roles you're curious about? And which of your current skills do you enjoy using the most?"
+    skills = profile.get('skills', [])
+    return f"Hello! I've analyzed your profile and see you have strong skills in {skills[0]['name'] if skills else 'your field'}. To fine-tune your career path, could you tell me what specific type of projects you enjoy working on the most?"
+
+def question_features(profile, turn):
+    return {
+        "rpgClass": (profile.get('rpgClass') or '').strip().lower(),
+        "topSkills": sorted(name.lower() for name in top_skills(profile)),
+        "wantsDomainChange": bool(profile.get('wantsDomainChange')),
+        "turn": turn
+    }
+
+def question_key(features):
+    digest = hashlib.blake2b(repr(sorted(features.items())).encode('utf-8'), digest_size=16).hexdigest()
+    return get_cache().key('questions', digest)
+
+def followup_request(profile, turn):
+    """LLM request for a feature-based follow-up question"""
+    change = "wants to move into a new domain" if profile.get('wantsDomainChange') else "wants to grow in their current domain"
+    return {
+        "model": "gpt-4o",
+        "messages": [
+            {"role": "system", "content": CHAT_FOLLOWUP_PROMPT},
+            {"role": "user", "content": (
+                f"Candidate class: {profile.get('rpgClass') or 'Unknown'}\n"
+                f"Top skills: {', '.join(top_skills(profile)) or 'Unknown'}\n"
+                f"The candidate {change}.\n"
+                f"This is follow-up question {turn} of the assessment."
+            )}
+        ],
+        "temperature": 0
+    }
+
+def cached_followup(profile, turn):
+    """(cached question or None, cache key to store a generated one under)"""
+    key = question_key(question_features(profile, turn))
+    return get_cache().get(key), key
+
+def store_followup(key, question):
+    get_cache().set(key, question, QUESTION_TTL)
+
+def fallback_followup(turn):
+    return FALLBACK_QUESTIONS[(turn - 1) % len(FALLBACK_QUESTIONS)]
@@ -0,0 +1,795 @@
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+import json
+import logging
+import uuid
+import jwt
+import bcrypt
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import wraps
+
+from models import db, User, CandidateProfile, AssessmentSession, Job
+from ai_service import AIService, CHAT_REEVALUATION_PROMPT
+from questions import opening_message, cached_followup, followup_request, store_followup, fallback_followup
+from scoring import calculate_build, get_compiled_job, jobs_requiring, score_against, skill_keys, sync_jobs_version
+from serialization import dumps_bytes, project
+from profiles import load_candidate_profile
+from avatars import avatar_id, get_or_build_job_avatars, has_candidate_avatar, parse_avatar_id, set_candidate_avatar
+from cache import get_cache
+from career_paths import adjacent_roles
+from candidates import STORE as CANDIDATES
+from uploads import UploadError, upload_keys, previous_upload, remember_upload, coalesce
+
+api = Blueprint('api', __name__)
+logger = logging.getLogger(__name__)
+
+@api.before_request
+def sync_shared_state():
+    # Pick up job changes made by other workers (or the seeder)
+    sync_jobs_version()
+
+
+# Background work that must stay off the response path (single worker keeps updates ordered)
+BACKGROUND = ThreadPoolExecutor(max_workers=1)
+
+# --- Authentication Helper Functions ---
+def hash_password(password):
+    """Hash a password using bcrypt"""
+    salt = bcrypt.gensalt()
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+def verify_password(password, hashed):
+    """Verify a password against its hash"""
+    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+def generate_token(public_id):
+    """Generate a JWT token for a user"""
+    payload = {
+        'public_id': public_id,
+        'exp': datetime.utcnow() + timedelta(days=7)  # Token expires in 7 days
+    }
+    return jwt.encode(payload, current_app.config['SECRET_KEY'], algorithm='HS256')
+
+def token_required(f):
+    """Decorator to protect routes that require authentication"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        token = request.headers.get('Authorization')
+        
+        if not token:
+            return jsonify({'error': 'Token is missing'}), 401
+            
+        try:
+            # Remove 'Bearer ' prefix if present
+            if token.startswith('Bearer '):
+                token = token[7:]
+            
+            data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
+            current_user = User.query.filter_by(public_id=data['public_id']).first()
+            
+            if not current_user:
+                return jsonify({'error': 'Invalid token'}), 401
+                
+        except Exception as e:
+            return jsonify({'error': 'Invalid token'}), 401
+            
+        return f(current_user, *args, **kwargs)
+    
+    return decorated
+
+# --- Authentication Routes ---
+@api.route('/api/auth/register', methods=['POST'])
+def register():
+    """Register a new user"""
+    data = request.json
+    
+    name = data.get('name', '').strip()
+    email = data.get('email', '').strip().lower()
+    password = data.get('password', '')
+    
+    # Validation
+    if not name or not email or not password:
+        return jsonify({'error': 'All fields are required'}), 400
+    if len(password) < 6:
+        return jsonify({'error': 'Password must be at least 6 characters'}), 400
+    
+    # Check if user already exists
+    if User.query.filter_by(email=email).first():
+        return jsonify({'error': 'User already exists with this email'}), 400
+    
+    # Create new user
+    hashed_pw = hash_password(password)
+    new_user = User(
+        public_id=str(uuid.uuid4()),
+        name=name,
+        email=email,
+        password_hash=hashed_pw
+    )
+    
+    db.session.add(new_user)
+    db.session.commit()
+    
+    # Generate token
+    token = generate_token(new_user.public_id)
+    
+    # Return user data (without password hash)
+    return jsonify({
+        'token': token,
+        'user': {
+            'name': new_user.name,
+            'email': new_user.email
+        }
+    }), 201
+
+@api.route('/api/auth/login', methods=['POST'])
+def login():
+    """Login an existing user"""
+    data = request.json
+    
+    email = data.get('email', '').strip().lower()
+    password = data.get('password', '')
+    
+    # Validation
+    if not email or not password:
+        return jsonify({'error': 'Email and password are required'}), 400
+    
+    # Check if user exists
+    user = User.query.filter_by(email=email).first()
+    
+    if not user or not verify_password(password, user.password_hash):
+        return jsonify({'error': 'Invalid email or password'}), 401
+    
+    # Generate token
+    token = generate_token(user.public_id)
+    
+    # Return user data (without password hash)
+    return jsonify({
+        'token': token,
+        'user': {
+            'name': user.name,
+            'email': user.email
+        }
+    })
+
+@api.route('/api/auth/me', methods=['GET'])
+@token_required
+def get_current_user(current_user):
+    """Get current user information"""
+    return jsonify({
+        'name': current_user.name,
+        'email': current_user.email
+    })
+
+def load_jobs_payload():
+    result = []
+    for job in Job.query.all():
+        skills = []
+        for s in job.skills_required:
+            skills.append({
+                "id": s.skill_id,
+                "name": s.name,
+                "type": s.type,
+                "importance": s.importance
+            })
+        result.append({
+            "jobId": job.job_id,
+            "title": job.title,
+            "domain": job.domain,
+            "description": job.description,
+            "skillsRequired": skills
+        })
+    return result
+
+@api.route('/api/jobs', methods=['GET'])
+def get_jobs():
+    cache = get_cache()
+    result = cache.get_or_set(cache.key('jobs', 'list'), load_jobs_payload)
+    return jsonify(project(result, request.args.get('fields')))
+
+def get_user_from_header(token):
+    """Resolve an optional Authorization header to a User (None if missing or invalid)"""
+    if not token:
+        return None
+    try:
+        if token.startswith('Bearer '): token = token[7:]
+        data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
+        return User.query.filter_by(public_id=data['public_id']).first()
+    except:
+        return None # Proceed as anonymous if token invalid (or return error if we want strict auth)
+
+def read_parse_options(form, body):
+    """Read linkedinUrl / wantsDomainChange from either a multipart form or a JSON body"""
+    if form:
+        return form.get('linkedinUrl'), form.get('wantsDomainChange') == 'true'
+    if body:
+        return body.get('linkedinUrl'), body.get('wantsDomainChange', False)
+    return None, False
+
+def save_candidate_profile(current_user, analysis, wants_domain_change):
+    """Create or update the CandidateProfile for an analysis and return the response payload"""
+    candidate_id = str(uuid.uuid4())
+    
+    if current_user:
+        profile = CandidateProfile.query.filter_by(user_id=current_user.id).first()
+        if profile:
+            # Update existing
+            profile.rpg_class = analysis['rpgClass']
+            profile.creativity_score = analysis['creativityScore']
+            profile.skills_json = json.dumps(analysis['skills'])
+            profile.meta_skills_json = json.dumps(analysis['metaSkills'])
+            profile.summary = f"Level {len(analysis['skills'])} {analysis['rpgClass']}"
+            candidate_id = profile.candidate_id # Keep existing ID
+        else:
+            # Create new linked to user
+            profile = CandidateProfile(
+                user_id=current_user.id,
+                candidate_id=candidate_id,
+                rpg_class=analysis['rpgClass'],
+                creativity_score=analysis['creativityScore'],
+                skills_json=json.dumps(analysis['skills']),
+                meta_skills_json=json.dumps(analysis['metaSkills']),
+                summary=f"Level {len(analysis['skills'])} {analysis['rpgClass']}",
+                wants_domain_change=wants_domain_change
+            )
+            db.session.add(profile)
+    else:
+        # Anonymous - Create new unlinked profile
+        profile = CandidateProfile(
+            user_id=None,
+            candidate_id=candidate_id,
+            rpg_class=analysis['rpgClass'],
+            creativity_score=analysis['creativityScore'],
+            skills_json=json.dumps(analysis['skills']),
+            meta_skills_json=json.dumps(analysis['metaSkills']),
+            summary=f"Level {len(analysis['skills'])} {analysis['rpgClass']}",
+            wants_domain_change=wants_domain_change
+        )
+        db.session.add(profile)
+    
+    db.session.commit()
+    
+    # Return the profile structure expected by frontend
+    return {
+        "candidateId": candidate_id,
+        "summary": f"Level {len(analysis['skills'])} {analysis['rpgClass']}",
+        "skills": analysis['skills'],
+        "metaSkills": analysis['metaSkills'],
+        "creativityScore": analysis['creativityScore'],
+        "rpgClass": analysis['rpgClass']
+    }
+
+@api.route('/api/candidate/parse', methods=['POST'])
+# @token_required # Ideally we require token, but for now we might handle anonymous uploads or check header manually
+def parse_candidate():
+    # Check for token manually to associate with user if logged in
+    current_user = get_user_from_header(request.headers.get('Authorization'))
+
+    # Check if file is present
+    cv_text = ""
+    file, upload = None, None
+    if 'file' in request.files:
+        file = request.files['file']
+        if file.filename != '':
+            # Read once for the content hash, the PDF parser reads it again
+            upload = file.read()
+            file.seek(0)
+    else:
+        data = request.form if request.form else request.json
+        cv_text = data.get('cvText', '')
+    
+    linkedin_url, wants_domain_change = read_parse_options(request.form, request.json if not request.form else None)
+    
+    if not upload and not cv_text and not linkedin_url:
+        return jsonify({"error": "No CV text, file, or LinkedIn URL provided"}), 400
+
+    # Retries, double-clicks and re-uploads of the same CV return the profile created the first time
+    keys, content_hash = upload_keys(
+        current_user.public_id if current_user else None, request.headers.get('Idempotency-Key'),
+        upload if upload is not None else cv_text, linkedin_url, wants_domain_change
+    )
+    previous = previous_upload(keys)
+    if previous:
+        return jsonify(previous)
+
+    def run():
+        text = cv_text
+        if upload is not None:
+            try:
+                text = AIService.extract_text_from_pdf(file)
+            except Exception as e:
+                raise UploadError({"error": f"Failed to parse PDF: {str(e)}"}, 400)
+        
+        if not text and not linkedin_url:
+            raise UploadError({"error": "No CV text, file, or LinkedIn URL provided"}, 400)
+
+        try:
+            # If we have a user, check if they already have a profile to update
+            # For now, we just re-analyze. In a real app, maybe we just update parts.
+            analysis = AIService.analyze_cv(text) # Pass linkedin_url if implemented in AIService
+        except ValueError as e:
+            raise UploadError({"error": str(e)}, 400)
+        except Exception as e:
+            raise UploadError({"error": f"Unexpected error during analysis: {str(e)}"}, 500)
+                
+        # Save/Update Profile in DB
+        result = save_candidate_profile(current_user, analysis, wants_domain_change)
+        remember_upload(keys, content_hash, result['candidateId'])
+        return result
+
+    try:
+        return jsonify(coalesce(keys, run))
+    except UploadError as e:
+        return jsonify(e.body), e.status
+
+
+@api.route('/api/candidate/builds', methods=['POST'])
+def create_builds():
+    data = request.json
+    candidate_profile = data.get('candidateProfile')
+    job_ids = data.get('jobIds', [])
+    
+    # Preferred: send just the candidateId and use the profile stored by parse/assessment
+    if not candidate_profile and data.get('candidateId'):
+        candidate_profile = load_candidate_profile(data['candidateId'])
+        if not candidate_profile:
+            return jsonify({"error": "Candidate profile not found"}), 404
+    
+    if not candidate_profile:
+        return jsonify({"error": "Missing candidate profile"}), 400
+        
+    candidate_id = candidate_profile.get('candidateId')
+    
+    builds = []
+    
+    # Fetch only the requested jobs from DB (job_id is unique, so indexed)
+    if job_ids:
+        jobs = Job.query.filter(Job.job_id.in_(job_ids)).all()
+    else:
+        jobs = Job.query.all()
+    
+    for job in jobs:
+        build_data = calculate_build(candidate_profile, job)
+        builds.append(build_data)
+
+    # Rescale scores so the best match is 100% (or close to it)
+    if builds:
+        max_score = max(b['matchScore'] for b in builds)
+        if max_score > 0:
+            scaling_factor = 1.0 / max_score
+            for build in builds:
+                # Scale and cap at 1.0 (just in case)
+                new_score = min(build['matchScore'] * scaling_factor, 1.0)
+                build['matchScore'] = round(new_score, 2)
+        else:
+             # If all scores are 0, maybe set them to a small baseline or leave as 0
+             pass
+
+    # Now process for response and cached avatars
+    final_builds = []
+    for build_data in builds:
+        # Prepare build object for response
+        build = {k: v for k, v in build_data.items() if k != 'skillCoverage'}
+        final_builds.append(build)
+        
+        # Update avatars (Recruiter View), replacing this candidate's existing one
+        if candidate_id:
+            set_candidate_avatar(build_data['jobId'], {
+                "avatarId": avatar_id(candidate_id, build_data['jobId']),
+                "candidateId": candidate_id,
+                "matchScore": build_data['matchScore'],
+                "gapCostHours": build_data['gapCostHours'],
+                "summary": f"Match for {build_data['jobTitle']}",
+                "primaryBranch": "General",
+                "skillCoverage": build_data['skillCoverage']
+            })
+        
+    builds = final_builds
+
+    response = {
+        "candidateId": candidate_id,
+        "baseProfile": candidate_profile,
+        "builds": builds
+    }
+    
+    # e.g. ?fields=-baseProfile to skip echoing the profile the client just sent
+    return jsonify(project(response, request.args.get('fields'), records='builds'))
+
+@api.route('/api/candidate/paths', methods=['GET'])
+def get_career_paths():
+    """Roles adjacent to a job the candidate matches well, smallest skill gap first"""
+    candidate_id = request.args.get('candidateId')
+    job_id = request.args.get('jobId')
+    limit = request.args.get('limit', 5, type=int)
+    
+    if not candidate_id or not job_id:
+        return jsonify({"error": "candidateId and jobId are required"}), 400
+    
+    candidate_profile = load_candidate_profile(candidate_id)
+    if not candidate_profile:
+        return jsonify({"error": "Candidate profile not found"}), 404
+    
+    return jsonify({
+        "candidateId": candidate_id,
+        "jobId": job_id,
+        "paths": adjacent_roles(candidate_profile, job_id, limit)
+    })
+
+@api.route('/api/recruiter/avatars/<jobId>', methods=['GET'])
+def get_avatars(jobId):
+    # Populate avatars from DB if nothing is cached yet
+    def build_avatars():
+        avatars = []
+        job = Job.query.filter_by(job_id=jobId).first()
+        
+        if job:
+            compiled = get_compiled_job(job)
+            # Compact in-memory candidates - skills JSON is not decoded per request
+            for candidate in CANDIDATES.all():
+                score = score_against(candidate, compiled)
+                
+                avatar = {
+                    "avatarId": avatar_id(candidate.candidate_id, jobId),
+                    "candidateId": candidate.candidate_id,
+                    "matchScore": score['matchScore'],
+                    "gapCostHours": score['gapCostHours'],
+                    "summary": f"Match for {job.title}",
+                    "primaryBranch": "General",
+                    "skillCoverage": {
+                        "criticalCovered": score['criticalCovered'],
+                        "criticalTotal": compiled.critical_total,
+                        "overallCovered": score['overallCovered'],
+                        "overallTotal": compiled.total
+                    }
+                }
+                avatars.append(avatar)
+        return avatars
+
+    avatars = get_or_build_job_avatars(jobId, build_avatars)
+    return jsonify(project({"jobId": jobId, "avatars": avatars}, request.args.get('fields'), records='avatars'))
+
+@api.route('/api/recruiter/scores', methods=['POST'])
+def batch_scores():
+    """Score matrix of many candidates x many jobs in one pass over each candidate.
+    
+    Body: {"jobIds": [...], "candidateIds": [...] (optional, default all), "stream": bool}.
+    With stream (or Accept: application/x-ndjson) the response is NDJSON: a jobs line,
+    one line per candidate, then a stats line. Ids that match no job / candidate are
+    listed in unknownJobIds / unknownCandidateIds of the jobs line.
+    """
+    data = request.json or {}
+    job_ids = data.get('jobIds') or []
+    candidate_ids = data.get('candidateIds')
+    stream = data.get('stream') or 'application/x-ndjson' in request.headers.get('Accept', '')
+    
+    def is_id_list(value):
+        return isinstance(value, list) and all(isinstance(item, str) for item in value)
+    
+    if not is_id_list(job_ids) or (candidate_ids is not None and not is_id_list(candidate_ids)):
+        return jsonify({"error": "jobIds and candidateIds must be lists of ids"}), 400
+    if not job_ids:
+        return jsonify({"error": "jobIds required"}), 400
+    
+    found = {job.job_id: job for job in Job.query.filter(Job.job_id.in_(job_ids)).all()}
+    compiled_jobs = [get_compiled_job(found[job_id]) for job_id in job_ids if job_id in found]
+    jobs_header = {
+        "jobs": [{
+            "jobId": c.job_id,
+            "jobTitle": c.title,
+            "criticalTotal": c.critical_total,
+            "overallTotal": c.total
+        } for c in compiled_jobs],
+        "unknownJobIds": [job_id for job_id in job_ids if job_id not in found]
+    }
+    
+    candidates = CANDIDATES.all(candidate_ids)
+    known = {candidate.candidate_id for candidate in candidates}
+    jobs_header["unknownCandidateIds"] = [c for c in (candidate_ids or []) if c not in known]
+    
+    stats = [{"candidates": 0, "matchScoreSum": 0.0, "fullCriticalCoverage": 0} for _ in compiled_jobs]
+    
+    def rows():
+        for candidate in candidates:
+            scores = []
+            for i, compiled in enumerate(compiled_jobs):
+                score = score_against(candidate, compiled)
+                scores.append(score)
+                stats[i]["candidates"] += 1
+                stats[i]["matchScoreSum"] += score["matchScore"]
+                if score["criticalCovered"] == compiled.critical_total:
+                    stats[i]["fullCriticalCoverage"] += 1
+            yield {"candidateId": candidate.candidate_id, "rpgClass": candidate.rpg_class_name, "scores": scores}
+    
+    def coverage():
+        return [{
+            "jobId": compiled.job_id,
+            "candidates": s["candidates"],
+            "avgMatchScore": round(s["matchScoreSum"] / s["candidates"], 2) if s["candidates"] else 0,
+            "fullCriticalCoverage": s["fullCriticalCoverage"]
+        } for compiled, s in zip(compiled_jobs, stats)]
+    
+    if stream:
+        def generate():
+            yield dumps_bytes(jobs_header) + b'\n'
+            for row in rows():
+                yield dumps_bytes(row) + b'\n'
+            yield dumps_bytes({"coverage": coverage()}) + b'\n'
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
+    rows_list = list(rows())
+    return jsonify({**jobs_header, "candidates": rows_list, "coverage": coverage()})
+
+@api.route('/api/recruiter/avatar/<avatarId>', methods=['GET'])
+def get_avatar_detail(avatarId):
+    # The avatarId names its candidate and job
+    candidate_id, found_job_id = parse_avatar_id(avatarId)
+            
+    if not candidate_id:
+        return jsonify({"error": "Avatar not found"}), 404
+        
+    # Reconstruct the build data from DB
+    candidate_profile = load_candidate_profile(candidate_id)
+    
+    if not candidate_profile:
+        return jsonify({"error": "Candidate profile not found"}), 404
+    
+    # Find the job
+    job = Job.query.filter_by(job_id=found_job_id).first()
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+        
+    # Calculate full build details
+    build_data = calculate_build(candidate_profile, job)
+    
+    nodes = []
+    edges = []
+    
+    # Build Tree Nodes
+    for covered in build_data['coveredSkills']:
+            nodes.append({
+                "id": covered['jobSkillId'],
+                "name": covered['name'], 
+                "type": "technical", # Placeholder
+                "status": "covered",
+                "importance": "high", # Placeholder
+                "evidence": [{"snippet": covered['explanation']}]
+            })
+            
+    for missing in build_data['missingSkills']:
+        nodes.append({
+            "id": missing['jobSkillId'],
+            "name": missing['name'],
+            "type": "technical", # Placeholder
+            "status": "missing",
+            "importance": missing['importance'],
+            "evidence": []
+        })
+            
+    return jsonify({
+        "avatarId": avatarId,
+        "jobId": found_job_id,
+        "tree": {
+            "nodes": nodes,
+            "edges": edges
+        },
+        "quests": build_data['quests']
+    })
+
+    return jsonify({
+        "avatarId": avatarId,
+        "jobId": found_job_id,
+        "tree": {
+            "nodes": nodes,
+            "edges": edges
+        },
+        "quests": build_data['quests']
+    })
+
+def rescore_candidate(app, candidate_id, changed_keys):
+    """Refresh cached avatars of one candidate, only for jobs whose required skills changed"""
+    try:
+        with app.app_context():
+            sync_jobs_version()
+            # Every stored avatar of the candidate must be replaced - a job's first get_avatars call keeps
+            # stored avatars over its own scan. Jobs without one are scored from the DB on that call.
+            affected = [
+                job_id for job_id in jobs_requiring(changed_keys) if has_candidate_avatar(job_id, candidate_id)
+            ]
+            if not affected:
+                return
+            
+            candidate_profile = load_candidate_profile(candidate_id)
+            if not candidate_profile:
+                return
+            
+            for job in Job.query.filter(Job.job_id.in_(affected)).all():
+                build_data = calculate_build(candidate_profile, job)
+                # Same avatarId as before, so open detail views stay valid
+                set_candidate_avatar(job.job_id, {
+                    "avatarId": avatar_id(candidate_id, job.job_id),
+                    "candidateId": candidate_id,
+                    "matchScore": build_data['matchScore'],
+                    "gapCostHours": build_data['gapCostHours'],
+                    "summary": f"Match for {job.title}",
+                    "primaryBranch": "General",
+                    "skillCoverage": build_data['skillCoverage']
+                })
+    except Exception:
+        logger.exception("Re-scoring failed", extra={"candidate_id": candidate_id})
+
+# --- Assessment Chat Endpoints ---
+
+@api.route('/api/assessment/start', methods=['POST'])
+def start_assessment():
+    data = request.json
+    candidate_id = data.get('candidateId')
+    
+    if not candidate_id:
+        return jsonify({"error": "Candidate ID required"}), 400
+        
+    profile = load_candidate_profile(candidate_id)
+    if not profile:
+        return jsonify({"error": "Profile not found"}), 404
+        
+    # Check if session exists
+    session = AssessmentSession.query.filter_by(candidate_id=candidate_id, status='active').first()
+    if not session:
+        session = AssessmentSession(candidate_id=candidate_id)
+        db.session.add(session)
+        db.session.commit()
+        
+    # Update session messages with the initial greeting/question if empty
+    messages = json.loads(session.messages)
+    if not messages:
+        messages.append({"role": "assistant", "content": opening_message(profile)})
+        session.messages = json.dumps(messages)
+        db.session.commit()
+    
+    return jsonify({
+        "sessionId": session.id,
+        "messages": messages
+    })
+
+def prepare_chat_turn(session_id, user_message):
+    """Load the session and build the LLM request for the next chat turn.
+    
+    Returns (turn, error) where error is a (body, status) tuple. The turn only holds
+    plain data so the LLM call can happen outside of any DB session. If the follow-up
+    question is already cached, turn['reply'] holds it and no LLM call is needed.
+    """
+    session = AssessmentSession.query.get(session_id)
+    if not session:
+        return None, ({"error": "Session not found"}, 404)
+    if session.status != 'active':
+        # Completed, or expired by the maintenance worker
+        return None, ({"error": f"Session is {session.status}"}, 409)
+        
+    messages = json.loads(session.messages)
+    messages.append({"role": "user", "content": user_message})
+    
+    # Check if we should complete (simple logic: after 3 user turns)
+    user_turns = sum(1 for m in messages if m['role'] == 'user')
+    
+    if user_turns >= 3:
+        # Re-evaluation Prompt
+        profile = CandidateProfile.query.filter_by(candidate_id=session.candidate_id).first()
+        current_skills = profile.skills_json
+        chat_history = "\n".join([f"{m['role']}: {m['content']}" for m in messages])
+        llm_request = {
+            "model": "gpt-4o",
+            "messages": [
+                {"role": "system", "content": CHAT_REEVALUATION_PROMPT},
+                {"role": "user", "content": f"Original Skills: {current_skills}\n\nChat History:\n{chat_history}"}
+            ],
+            "response_format": {"type": "json_object"}
+        }
+        return {
+            "sessionId": session.id,
+            "candidateId": session.candidate_id,
+            "messages": messages,
+            "turn": user_turns,
+            "final": True,
+            "request": llm_request
+        }, None
+    
+    # Continue Conversation - the question only depends on profile features, so it is usually cached
+    profile = load_candidate_profile(session.candidate_id) or {}
+    question, question_key = cached_followup(profile, user_turns)
+    return {
+        "sessionId": session.id,
+        "candidateId": session.candidate_id,
+        "messages": messages,
+        "turn": user_turns,
+        "final": False,
+        "reply": question,
+        "questionKey": question_key,
+        "request": None if question else followup_request(profile, user_turns)
+    }, None
+
+def finish_chat_turn(turn, ai_reply):
+    """Persist the LLM reply for a prepared turn and return (body, status)"""
+    session = AssessmentSession.query.get(turn['sessionId'])
+    # The session may have expired or been completed while the LLM was answering
+    if not session or session.status != 'active':
+        return {"error": "Session is no longer active"}, 409
+    messages = turn['messages']
+    
+    if not turn['final']:
+        if turn.get('reply') is None and turn.get('questionKey'):
+            # Freshly generated - serve it to the next candidate with the same features
+            store_followup(turn['questionKey'], ai_reply)
+        messages.append({"role": "assistant", "content": ai_reply})
+        session.messages = json.dumps(messages)
+        db.session.commit()
+        
+        return {
+            "messages": messages,
+            "status": "active"
+        }, 200
+    
+    try:
+        result = json.loads(ai_reply)
+        
+        # Update Profile
+        profile = CandidateProfile.query.filter_by(candidate_id=turn['candidateId']).first()
+        old_skills = json.loads(profile.skills_json) if profile.skills_json else []
+        profile.skills_json = json.dumps(result['skills'])
+        profile.rpg_class = result.get('rpgClass', profile.rpg_class)
+        profile.creativity_score = result.get('creativityScore', profile.creativity_score)
+        profile.summary = result.get('summary', profile.summary)
+        
+        final_message = "Thank you! I've updated your profile with these new insights. Let's see your career paths now."
+        messages.append({"role": "assistant", "content": final_message})
+        session.messages = json.dumps(messages)
+        session.status = 'completed'
+        db.session.commit()
+        
+        # Propagate the skill change to cached recruiter views in the background
+        changed_keys = skill_keys(old_skills) ^ skill_keys(result['skills'])
+        if changed_keys:
+            BACKGROUND.submit(rescore_candidate, current_app._get_current_object(), profile.candidate_id, changed_keys)
+        
+        return {
+            "messages": messages,
+            "status": "completed",
+            "updatedProfile": {
+                "candidateId": profile.candidate_id,
+                "skills": result['skills'],
+                "rpgClass": profile.rpg_class,
+                "summary": profile.summary
+            }
+        }, 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return chat_failure(turn, e)[1]
+
+def chat_failure(turn, error):
+    """Handle a failed LLM call: (reply to use instead, None) or (None, (error body, status))"""
+    if not turn['final']:
+        # Templated question - not cached, so the next candidate retries generation
+        logger.warning("Follow-up question generation failed, using fallback", extra={"error": str(error)})
+        turn['questionKey'] = None
+        return fallback_followup(turn['turn']), None
+    logger.error("AI Re-eval Error", extra={"error": str(error)})
+    return None, ({"error": "Failed to re-evaluate"}, 500)
+
+@api.route('/api/assessment/chat', methods=['POST'])
+def chat_assessment():
+    data = request.json
+    
+    turn, error = prepare_chat_turn(data.get('sessionId'), data.get('message'))
+    if error:
+        return jsonify(error[0]), error[1]
+    
+    # AI Logic (skipped when the follow-up question was cached)
+    ai_reply = turn.get('reply')
+    if ai_reply is None:
+        try:
+            ai_reply = AIService.complete(turn['request'])
+        except Exception as e:
+            ai_reply, error = chat_failure(turn, e)
+            if error:
+                return jsonify(error[0]), error[1]
+    
+    body, status = finish_chat_turn(turn, ai_reply)
+    return jsonify(body), status
@@ -0,0 +1,230 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session, selectinload
+
+from cache import get_cache
+from candidates import SKILL_IDS, SKILL_NAMES
+from models import Job, JobSkill
+
+# Learning hours per missing skill, by importance
+QUEST_HOURS = {'critical': 10}
+DEFAULT_QUEST_HOURS = 5
+
+
+class CompiledJob:
+    """Everything calculate_build needs from a job, precomputed once per job.
+
+    The missing-skill and quest dicts are shared between builds - treat them as read-only.
+    """
+    __slots__ = ('job_id', 'title', 'requirements', 'critical_total', 'total', 'keys', 'key_ids')
+
+    def __init__(self, job):
+        self.job_id = job.job_id
+        self.title = job.title
+        # (skill_id, name, lowercased name, is_critical, missing dict, quest dict) per required skill
+        self.requirements = []
+        for req_skill in job.skills_required:
+            hours = QUEST_HOURS.get(req_skill.importance, DEFAULT_QUEST_HOURS)
+            missing = {
+                "jobSkillId": req_skill.skill_id,
+                "name": req_skill.name,
+                "importance": req_skill.importance
+            }
+            quest = {
+                "id": f"quest_{req_skill.skill_id}",
+                "title": f"Learn {req_skill.name}",
+                "description": f"Complete a course or project to demonstrate {req_skill.name}.",
+                "estimatedHours": hours
+            }
+            self.requirements.append((
+                req_skill.skill_id, req_skill.name, req_skill.name.lower(),
+                req_skill.importance == 'critical', missing, quest
+            ))
+        self.critical_total = sum(1 for r in self.requirements if r[3])
+        self.total = len(self.requirements)
+        # Every key a candidate skill can match on (ids and lowercased names)
+        self.keys = frozenset(r[0] for r in self.requirements) | frozenset(r[2] for r in self.requirements)
+        # Interned (id, name) keys per requirement, for scoring CompactCandidates
+        self.key_ids = [(SKILL_IDS.intern(r[0]), SKILL_NAMES.intern(r[2])) for r in self.requirements]
+
+
+# job_id -> CompiledJob
+_COMPILED_JOBS = {}
+# skill key -> set of job_ids requiring it, over all jobs (None until first needed)
+_SKILL_INDEX = None
+# Shared 'jobs' namespace version the local caches were built against
+_SEEN_JOBS_VERSION = None
+
+def skill_keys(skills):
+    """Keys a list of candidate skill dicts can match job requirements on"""
+    return {s['id'] for s in skills} | {s['name'].lower() for s in skills}
+
+def get_compiled_job(job):
+    """Compiled representation of a Job, built on first use"""
+    compiled = _COMPILED_JOBS.get(job.job_id)
+    if compiled is None:
+        compiled = _COMPILED_JOBS[job.job_id] = CompiledJob(job)
+    return compiled
+
+def compile_jobs(jobs=None):
+    """(Re)build the compiled representation of the given jobs, or of all jobs - at startup and
+    after seeding, so the first requests don't pay for it. Needs an app context."""
+    if jobs is None:
+        # Sync first, so the next request's sync_jobs_version() keeps what is compiled here
+        sync_jobs_version()
+        jobs = Job.query.options(selectinload(Job.skills_required)).all()
+    for job in jobs:
+        _COMPILED_JOBS[job.job_id] = CompiledJob(job)
+
+def jobs_requiring(keys):
+    """job_ids of all jobs requiring any of the given skill keys (needs an app context)"""
+    global _SKILL_INDEX
+    index = _SKILL_INDEX
+    if index is None:
+        index = {}
+        for job in Job.query.options(selectinload(Job.skills_required)).all():
+            for key in get_compiled_job(job).keys:
+                index.setdefault(key, set()).add(job.job_id)
+        _SKILL_INDEX = index
+    job_ids = set()
+    for key in keys:
+        job_ids |= index.get(key, set())
+    return job_ids
+
+def _drop_local(job_ids=None):
+    global _SKILL_INDEX
+    _SKILL_INDEX = None
+    if job_ids is None:
+        _COMPILED_JOBS.clear()
+        return
+    for job_id in job_ids:
+        _COMPILED_JOBS.pop(job_id, None)
+
+def invalidate_jobs(job_ids=None):
+    """Drop compiled jobs (all of them if job_ids is None), here and in every other worker"""
+    _drop_local(job_ids)
+    # Cached job lists and match results depend on the jobs too
+    cache = get_cache()
+    cache.bump('jobs')
+    cache.bump('avatars')
+
+def sync_jobs_version():
+    """Drop local compiled jobs if another process changed jobs since they were built"""
+    global _SEEN_JOBS_VERSION
+    version = get_cache().namespace_version('jobs')
+    if version != _SEEN_JOBS_VERSION:
+        _drop_local()
+        _SEEN_JOBS_VERSION = version
+
+# Set session.info[SKIP_JOB_EVENTS] for bulk loads that call invalidate_jobs() themselves once done
+SKIP_JOB_EVENTS = 'skip_job_events'
+# Recorded instead of a job_id when every job has to be dropped
+ALL_JOBS = None
+
+def _note_job_change(target, job_id):
+    session = object_session(target)
+    if session is None:
+        invalidate_jobs(None if job_id is ALL_JOBS else [job_id])
+    elif not session.info.get(SKIP_JOB_EVENTS):
+        # Invalidated once per commit (_drop_committed_jobs) rather than once per row
+        session.info.setdefault('changed_jobs', set()).add(job_id)
+
+@event.listens_for(Job, 'after_insert')
+@event.listens_for(Job, 'after_update')
+@event.listens_for(Job, 'after_delete')
+def _job_changed(mapper, connection, target):
+    _note_job_change(target, target.job_id)
+
+@event.listens_for(JobSkill, 'after_insert')
+@event.listens_for(JobSkill, 'after_update')
+@event.listens_for(JobSkill, 'after_delete')
+def _job_skill_changed(mapper, connection, target):
+    # Skill rows only know the parent's integer PK, and job edits are rare - just drop everything.
+    # Bulk Query.delete() bypasses these events, callers doing that must invalidate_jobs() themselves.
+    _note_job_change(target, ALL_JOBS)
+
+@event.listens_for(Session, 'after_commit')
+def _drop_committed_jobs(session):
+    changed = session.info.pop('changed_jobs', None)
+    if changed:
+        invalidate_jobs(None if ALL_JOBS in changed else changed)
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_rolled_back_jobs(session):
+    session.info.pop('changed_jobs', None)
+
+
+def calculate_build(candidate_profile, job):
+    """Helper to calculate match score, skills, and quests for a candidate and job (SQLAlchemy object)"""
+    compiled = get_compiled_job(job)
+    candidate_skills = candidate_profile.get('skills', [])
+
+    # Create a mapping by both ID and name for flexible matching
+    candidate_skills_by_id = {s['id']: s for s in candidate_skills}
+    candidate_skills_by_name = {s['name'].lower(): s for s in candidate_skills}
+
+    covered_skills = []
+    missing_skills = []
+    quests = []
+
+    covered_critical = 0
+    gap_cost = 0
+
+    for skill_id, name, name_lower, is_critical, missing, quest in compiled.requirements:
+        # Try to match by ID first, then by name (case-insensitive)
+        matched_skill = candidate_skills_by_id.get(skill_id) or candidate_skills_by_name.get(name_lower)
+
+        if matched_skill:
+            if is_critical:
+                covered_critical += 1
+            covered_skills.append({
+                "jobSkillId": skill_id,
+                "name": name,
+                "sourceSkillIds": [matched_skill['id']],
+                "explanation": f"Matched {name} (Level: {matched_skill.get('level', 'N/A')})",
+                "category": matched_skill.get('category', 'Other')
+            })
+        else:
+            missing_skills.append(missing)
+            quests.append(quest)
+            gap_cost += quest['estimatedHours']
+
+    # Simple score calculation
+    match_count = len(covered_skills)
+    match_score = match_count / compiled.total if compiled.total > 0 else 0
+
+    return {
+        "jobId": compiled.job_id,
+        "jobTitle": compiled.title,
+        "matchScore": round(match_score, 2),
+        "gapCostHours": gap_cost,
+        "coveredSkills": covered_skills,
+        "missingSkills": missing_skills,
+        "quests": quests,
+        "skillCoverage": {
+            "criticalCovered": covered_critical,
+            "criticalTotal": compiled.critical_total,
+            "overallCovered": match_count,
+            "overallTotal": compiled.total
+        }
+    }
+
+
+def score_against(candidate, compiled):
+    """Match score, gap hours and coverage of a CompactCandidate for one compiled job.
+
+    Same numbers as calculate_build, without building the covered/missing/quest lists.
+    """
+    covered = covered_critical = gap_cost = 0
+    for (id_key, name_key), requirement in zip(compiled.key_ids, compiled.requirements):
+        if candidate.has_id(id_key) or candidate.has_name(name_key):
+            covered += 1
+            if requirement[3]:
+                covered_critical += 1
+        else:
+            gap_cost += requirement[5]['estimatedHours']
+    return {
+        "matchScore": round(covered / compiled.total, 2) if compiled.total > 0 else 0,
+        "gapCostHours": gap_cost,
+        "criticalCovered": covered_critical,
+        "overallCovered": covered
+    }
@@ -1,4 +1,7 @@
-from app import app, db, Job, JobSkill
+from app import create_app, init_db
+from models import db, Job, JobSkill
+from scoring import SKIP_JOB_EVENTS, compile_jobs, invalidate_jobs
+from career_paths import build_similarity_index
 import json
 import os
 
@@ -12,7 +15,12 @@ def seed_jobs():
     with open(data_path, 'r') as f:
         jobs_data = json.load(f)
 
+    app = create_app()
+    init_db(app)
     with app.app_context():
+        # Jobs are invalidated once after the commit, not per inserted row
+        db.session.info[SKIP_JOB_EVENTS] = True
+
         # Clear existing jobs to avoid duplicates
         print("Clearing existing jobs...")
         JobSkill.query.delete()
@@ -40,7 +48,14 @@ def seed_jobs():
                 db.session.add(skill)
         
         db.session.commit()
+        db.session.info.pop(SKIP_JOB_EVENTS)
+        invalidate_jobs() # bulk deletes and skipped events - drop everything once
+        compile_jobs()
         print("Jobs seeded successfully!")
+        
+        # Only jobs whose skill sets changed are re-hashed
+        stats = build_similarity_index()
+        print(f"Similarity index updated: {stats}")
 
 if __name__ == '__main__':
     seed_jobs()
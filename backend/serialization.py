@@ -0,0 +1,133 @@
+import gzip
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+# Optional speedups - plain json / gzip are used when these are not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Responses smaller than this are not worth compressing
+COMPRESS_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def dumps_bytes(obj):
+    """Serialize to compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=DefaultJSONProvider.default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=DefaultJSONProvider.default, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify() through orjson when available"""
+
+    def dumps(self, obj, **kwargs):
+        # Explicit formatting options (indent, sort_keys...) are only supported by the stdlib encoder
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
+
+
+def choose_encoding(accept_encoding):
+    """Pick 'br' or 'gzip' from an Accept-Encoding header (None if neither is accepted)"""
+    accepted = set()
+    for part in (accept_encoding or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        if params.strip().replace(' ', '') in ('q=0', 'q=0.0'):
+            continue
+        accepted.add(coding.strip().lower())
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+def compress_response(response):
+    """after_request hook: gzip/br large JSON responses if the client accepts it"""
+    from flask import request
+
+    if (response.direct_passthrough or response.is_streamed or response.status_code < 200 or response.status_code == 206
+            or 'Content-Encoding' in response.headers or response.mimetype != 'application/json'):
+        return response
+
+    encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+    if encoding is None:
+        return response
+
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+
+    response.set_data(compress(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def parse_fields(fields):
+    """Split a fields= parameter into (keys to keep or None, keys to drop).
+
+    "a,b" keeps only a and b on each record, "-evidence,-reasoning" drops those keys at any depth.
+    """
+    include, exclude = set(), set()
+    for name in (fields or '').split(','):
+        name = name.strip()
+        if name.startswith('-'):
+            exclude.add(name[1:])
+        elif name:
+            include.add(name)
+    return (include or None), exclude
+
+def _drop_keys(value, exclude):
+    if isinstance(value, dict):
+        return {k: _drop_keys(v, exclude) for k, v in value.items() if k not in exclude}
+    if isinstance(value, list):
+        return [_drop_keys(v, exclude) for v in value]
+    return value
+
+def _keep_keys(records, include):
+    return [{k: v for k, v in item.items() if k in include} for item in records]
+
+def project(payload, fields, records=None):
+    """Apply a fields= projection to a response payload.
+
+    Inclusion applies to each record: the items of a list payload, or of payload[records]
+    for an envelope like {"jobId": ..., "avatars": [...]} (whose other keys are kept).
+    Without records, a dict payload is itself the record.
+    """
+    include, exclude = parse_fields(fields)
+    if include:
+        if isinstance(payload, list):
+            payload = _keep_keys(payload, include)
+        elif records is not None and isinstance(payload, dict) and records in payload:
+            payload = {**payload, records: _keep_keys(payload[records], include)}
+        elif isinstance(payload, dict):
+            payload = {k: v for k, v in payload.items() if k in include}
+    if exclude:
+        payload = _drop_keys(payload, exclude)
+    return payload
@@ -0,0 +1,62 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Backend modules import each other as top-level modules (run from backend/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging_setup
+
+# Keep test runs out of backend/logs
+logging_setup.LOG_DIR = tempfile.mkdtemp(prefix='magenta-test-logs-')
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """App on an in-memory database with its own cache file and fresh per-process state"""
+    import cache
+    import scoring
+    from app import create_app
+    from candidates import STORE
+    from models import db
+
+    monkeypatch.setenv('CACHE_URL', f"sqlite:///{tmp_path / 'cache.db'}")
+    monkeypatch.setattr(cache, '_cache', None)
+    scoring._drop_local()
+    monkeypatch.setattr(scoring, '_SEEN_JOBS_VERSION', None)
+    STORE.by_id, STORE._max_pk, STORE._seen_change = {}, 0, None
+
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def add_job(job_id, skills, title=None):
+    """Insert a job; skills are (skill_id, name, importance) tuples"""
+    from models import db, Job, JobSkill
+    job = Job(job_id=job_id, title=title or job_id.upper(), domain='Tech')
+    job.skills_required = [JobSkill(skill_id=s, name=n, importance=i) for s, n, i in skills]
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+def add_profile(candidate_id, skills, **columns):
+    """Insert a candidate profile; skills are (id, name) tuples"""
+    import json
+    from models import db, CandidateProfile
+    profile = CandidateProfile(
+        candidate_id=candidate_id, rpg_class='Code Wizard', creativity_score=0.5, summary='',
+        skills_json=json.dumps([{"id": i, "name": n, "level": "advanced", "category": "Code"} for i, n in skills]),
+        meta_skills_json='[]', **columns
+    )
+    db.session.add(profile)
+    db.session.commit()
+    return profile
@@ -0,0 +1,203 @@
+import threading
+import time
+
+import pytest
+
+from cache import SQLiteBackend, SharedCache
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of the redis-py API SharedCache uses"""
+
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+        self.expiry = {}
+        self._guard = threading.Lock()
+
+    def _alive(self, key):
+        expires_at = self.expiry.get(key)
+        if expires_at is not None and expires_at <= time.time():
+            self.values.pop(key, None)
+            self.hashes.pop(key, None)
+            self.expiry.pop(key, None)
+        return key in self.values or key in self.hashes
+
+    def get(self, key):
+        with self._guard:
+            return self.values.get(key) if self._alive(key) else None
+
+    def set(self, key, value, ex=None, nx=False):
+        with self._guard:
+            if nx and self._alive(key):
+                return None
+            self.values[key] = value
+            self.expiry.pop(key, None)
+            if ex:
+                self.expiry[key] = time.time() + ex
+            return True
+
+    def delete(self, *keys):
+        with self._guard:
+            for key in keys:
+                self.values.pop(key, None)
+                self.hashes.pop(key, None)
+                self.expiry.pop(key, None)
+
+    def incr(self, key):
+        with self._guard:
+            value = int(self.values.get(key, 0)) + 1 if self._alive(key) else 1
+            self.values[key] = str(value).encode()
+            return value
+
+    def hget(self, name, key):
+        with self._guard:
+            return self.hashes.get(name, {}).get(key) if self._alive(name) else None
+
+    def hgetall(self, name):
+        with self._guard:
+            return {k.encode(): v for k, v in self.hashes.get(name, {}).items()} if self._alive(name) else {}
+
+    def hset(self, name, key=None, value=None, mapping=None):
+        with self._guard:
+            self._alive(name)
+            fields = self.hashes.setdefault(name, {})
+            fields.update(mapping or {})
+            if key is not None:
+                fields[key] = value
+            return len(mapping or {}) + (key is not None)
+
+    def hdel(self, name, *keys):
+        with self._guard:
+            for key in keys:
+                self.hashes.get(name, {}).pop(key, None)
+
+    def expire(self, name, seconds):
+        with self._guard:
+            if self._alive(name):
+                self.expiry[name] = time.time() + seconds
+
+
+@pytest.fixture(params=['fake-redis', 'sqlite'])
+def backend(request, tmp_path):
+    if request.param == 'sqlite':
+        return SQLiteBackend(str(tmp_path / 'cache.db'))
+    return FakeRedis()
+
+@pytest.fixture
+def cache(backend):
+    return SharedCache(backend)
+
+
+def test_set_get_delete(cache):
+    key = cache.key('profiles', 'c1')
+    assert cache.get(key) is None
+    cache.set(key, {"skills": ["Python"]})
+    assert cache.get(key) == {"skills": ["Python"]}
+    cache.delete(key)
+    assert cache.get(key) is None
+
+def test_ttl_expiry(cache):
+    key = cache.key('profiles', 'c1')
+    cache.set(key, 1, ttl=0.05)
+    assert cache.get(key) == 1
+    time.sleep(0.1)
+    assert cache.get(key) is None
+
+def test_set_nx_only_takes_missing_or_expired_keys(backend):
+    assert backend.set('lock', b'1', ex=0.05, nx=True)
+    assert not backend.set('lock', b'2', ex=0.05, nx=True)
+    time.sleep(0.1)
+    assert backend.set('lock', b'3', ex=1, nx=True)
+    assert backend.get('lock') == b'3'
+
+def test_acquire(cache):
+    assert cache.acquire('maintenance', 1)
+    assert not cache.acquire('maintenance', 1)
+
+def test_incr(backend):
+    assert backend.incr('counter') == 1
+    assert backend.incr('counter') == 2
+
+def test_bump_invalidates_namespace(cache):
+    key = cache.key('jobs', 'all')
+    cache.set(key, ['j1'])
+    other = cache.key('profiles', 'c1')
+    cache.set(other, 'kept')
+
+    assert cache.bump('jobs') == 1
+    assert cache.namespace_version('jobs') == 1
+    assert cache.key('jobs', 'all') != key
+    assert cache.get(cache.key('jobs', 'all')) is None
+    assert cache.get(cache.key('profiles', 'c1')) == 'kept'
+
+def test_hash_fields_are_updated_independently(cache):
+    key = cache.key('avatars', 'job', 'j1')
+    cache.hset(key, {'c1': {'matchScore': 0.5}, 'c2': {'matchScore': 0.7}})
+    cache.hset(key, {'c1': {'matchScore': 0.9}})
+    assert cache.hgetall(key) == {'c1': {'matchScore': 0.9}, 'c2': {'matchScore': 0.7}}
+    assert cache.hget(key, 'c2') == {'matchScore': 0.7}
+    cache.hdel(key, 'c2')
+    assert cache.hget(key, 'c2') is None
+    assert cache.hgetall(cache.key('avatars', 'job', 'j2')) == {}
+
+def test_hash_expires_as_a_whole(cache):
+    key = cache.key('avatars', 'job', 'j1')
+    cache.hset(key, {'c1': 1}, ttl=0.05)
+    time.sleep(0.1)
+    assert cache.hgetall(key) == {}
+    cache.hset(key, {'c2': 2})
+    assert cache.hgetall(key) == {'c2': 2}
+
+def test_concurrent_hash_writes_are_not_lost(cache):
+    key = cache.key('avatars', 'job', 'j1')
+    threads = [threading.Thread(target=cache.hset, args=(key, {f'c{i}': i})) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache.hgetall(key)) == 20
+
+def test_hashes_survive_eviction(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / 'cache.db'), max_entries=10)
+    cache = SharedCache(backend)
+    key = cache.key('avatars', 'job', 'j1')
+    cache.hset(key, {'c1': 1})
+    for i in range(50):
+        cache.set(cache.key('profiles', i), i)
+    backend.evict()
+    assert cache.hgetall(key) == {'c1': 1}
+    assert cache.get(cache.key('profiles', 0)) is None
+
+def test_get_or_set_does_not_cache_none(cache):
+    key = cache.key('profiles', 'missing')
+    calls = []
+    for _ in range(2):
+        assert cache.get_or_set(key, lambda: calls.append(1)) is None
+    assert len(calls) == 2
+
+def test_get_or_set_is_single_flight(backend):
+    # Two SharedCaches on one backend behave like two worker processes
+    caches = [SharedCache(backend), SharedCache(backend)]
+    key = caches[0].key('jobs', 'all')
+    calls = []
+    barrier = threading.Barrier(10)
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.2)
+        return ['j1', 'j2']
+
+    results = []
+    def worker(i):
+        barrier.wait()
+        results.append(caches[i % 2].get_or_set(key, loader))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [['j1', 'j2']] * 10
@@ -0,0 +1,43 @@
+import random
+
+from career_paths import band_buckets, build_similarity_index, minhash, similar_jobs
+from conftest import add_job
+
+
+def _pair(rng, shared, unique):
+    """Two token sets with Jaccard similarity shared / (shared + 2 * unique)"""
+    common = [f"s{rng.random()}" for _ in range(shared)]
+    return (common + [f"a{rng.random()}" for _ in range(unique)],
+            common + [f"b{rng.random()}" for _ in range(unique)])
+
+def _candidate_rate(similarity_params, trials=200):
+    rng = random.Random(7)
+    found = 0
+    for _ in range(trials):
+        a, b = _pair(rng, *similarity_params)
+        found += bool(set(band_buckets(minhash(a))) & set(band_buckets(minhash(b))))
+    return found / trials
+
+def test_moderately_similar_pairs_become_candidates():
+    # Jaccard 6/20 = 0.3, the kind of overlap career-change suggestions need
+    assert _candidate_rate((6, 7)) >= 0.85
+
+def test_dissimilar_pairs_rarely_become_candidates():
+    # Jaccard 1/19 ~ 0.05
+    assert _candidate_rate((1, 9)) <= 0.2
+
+def test_similar_jobs_recall_on_synthetic_catalog(app):
+    base = [(f"core{i}", f"Core {i}", 'medium') for i in range(10)]
+    add_job('base', base)
+    # 20 roles sharing 5 of base's 10 skills plus 5 of their own: Jaccard 5/15 ~ 0.33
+    for n in range(20):
+        add_job(f"near{n}", base[:5] + [(f"n{n}x{i}", f"Near {n} {i}", 'medium') for i in range(5)])
+    # Unrelated roles
+    for n in range(20):
+        add_job(f"far{n}", [(f"f{n}x{i}", f"Far {n} {i}", 'medium') for i in range(10)])
+    build_similarity_index()
+
+    found = dict(similar_jobs('base'))
+    near = [job_id for job_id in found if job_id.startswith('near')]
+    assert len(near) >= 18
+    assert not any(job_id.startswith('far') for job_id in found)
@@ -0,0 +1,41 @@
+import scoring
+from cache import get_cache
+from conftest import add_job
+from models import db, Job, JobSkill
+
+
+def test_job_without_skills_shows_up_in_cached_list(client):
+    add_job('j1', [('python', 'Python', 'critical')])
+    assert [j['jobId'] for j in client.get('/api/jobs').get_json()] == ['j1']
+
+    db.session.add(Job(job_id='j2', title='Intern'))
+    db.session.commit()
+    assert [j['jobId'] for j in client.get('/api/jobs').get_json()] == ['j1', 'j2']
+
+def test_one_invalidation_per_commit(app):
+    cache = get_cache()
+    before = cache.namespace_version('jobs')
+    job = Job(job_id='j1', title='Data Engineer')
+    job.skills_required = [JobSkill(skill_id=f"s{i}", name=f"Skill {i}", importance='medium') for i in range(8)]
+    db.session.add(job)
+    db.session.commit()
+    assert cache.namespace_version('jobs') == before + 1
+
+def test_skipped_events_do_not_invalidate(app):
+    cache = get_cache()
+    before = cache.namespace_version('jobs')
+    db.session.info[scoring.SKIP_JOB_EVENTS] = True
+    try:
+        add_job('j1', [('python', 'Python', 'critical')])
+    finally:
+        db.session.info.pop(scoring.SKIP_JOB_EVENTS)
+    assert cache.namespace_version('jobs') == before
+
+def test_compile_jobs_survives_the_first_request(client):
+    add_job('j1', [('python', 'Python', 'critical')])
+    scoring._drop_local()
+    scoring.compile_jobs()
+    compiled = scoring._COMPILED_JOBS['j1']
+
+    client.get('/api/jobs') # runs sync_jobs_version() first
+    assert scoring._COMPILED_JOBS.get('j1') is compiled
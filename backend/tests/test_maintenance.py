@@ -0,0 +1,57 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import maintenance
+from avatars import get_job_avatars
+from conftest import add_job, add_profile
+from models import db, AssessmentSession, CandidateProfile, User
+
+
+def _session(candidate_id, status, age):
+    when = datetime.utcnow() - age
+    db.session.add(AssessmentSession(candidate_id=candidate_id, status=status, created_at=when, updated_at=when))
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(maintenance, 'ARCHIVE_DIR', str(tmp_path / 'archive'))
+    return tmp_path / 'archive'
+
+
+def test_run_maintenance(app, archive_dir):
+    old = datetime.utcnow() - timedelta(days=60)
+    user = User(public_id='u1', name='U', email='u@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    add_profile('old-anon', [('python', 'Python')], created_at=old)
+    add_profile('old-anon-active', [('python', 'Python')], created_at=old)
+    add_profile('old-user', [('python', 'Python')], created_at=old, user_id=user.id)
+    add_profile('new-anon', [('python', 'Python')])
+
+    _session('old-anon-active', 'active', timedelta(hours=1))
+    _session('new-anon', 'active', timedelta(days=2))      # stale -> expired
+    _session('old-user', 'completed', timedelta(days=40))  # past retention -> deleted
+    _session('old-user', 'expired', timedelta(days=1))     # kept
+    db.session.commit()
+
+    report = maintenance.run_maintenance()
+
+    assert report['sessionsExpired'] == 1
+    assert report['sessionsDeleted'] == 1
+    assert report['profilesArchived'] == 1
+    assert sorted(p.candidate_id for p in CandidateProfile.query.all()) == ['new-anon', 'old-anon-active', 'old-user']
+    assert sorted(s.status for s in AssessmentSession.query.all()) == ['active', 'expired', 'expired']
+    archived = [json.loads(line) for line in next(archive_dir.iterdir()).read_text().splitlines()]
+    assert [r['candidateId'] for r in archived] == ['old-anon']
+
+def test_archiving_drops_only_archived_avatars(app, client, archive_dir):
+    add_job('j1', [('python', 'Python', 'critical')])
+    add_profile('old-anon', [('python', 'Python')], created_at=datetime.utcnow() - timedelta(days=60))
+    add_profile('new-anon', [('python', 'Python')])
+    client.get('/api/recruiter/avatars/j1')
+
+    maintenance.run_maintenance()
+
+    # Still a complete cached list (no rescan), minus the archived candidate
+    assert [a['candidateId'] for a in get_job_avatars('j1')] == ['new-anon']
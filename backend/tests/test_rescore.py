@@ -0,0 +1,35 @@
+import json
+
+import routes
+from conftest import add_job, add_profile
+
+
+def test_assessment_rescores_avatars_stored_by_builds(app, client, monkeypatch):
+    add_job('j1', [('python', 'Python', 'critical')])
+    add_job('j2', [('excel', 'Excel', 'high'), ('sql', 'SQL', 'high')])
+    add_profile('c1', [('python', 'Python')])
+
+    builds = client.post('/api/candidate/builds', json={"candidateId": 'c1'}).get_json()['builds']
+    assert {b['jobId']: b['matchScore'] for b in builds}['j2'] == 0.0
+
+    def complete(request_kwargs):
+        if 'response_format' in request_kwargs:
+            # Final re-evaluation: the chat revealed Excel and SQL
+            skills = [{"id": s, "name": n, "level": "advanced", "category": "Data"}
+                      for s, n in [('python', 'Python'), ('excel', 'Excel'), ('sql', 'SQL')]]
+            return json.dumps({"skills": skills, "rpgClass": "Data Alchemist"})
+        return "Tell me more about that?"
+    monkeypatch.setattr(routes.AIService, 'complete', complete)
+
+    session_id = client.post('/api/assessment/start', json={"candidateId": 'c1'}).get_json()['sessionId']
+    for message in ['I use spreadsheets', 'and databases', 'daily']:
+        body = client.post('/api/assessment/chat', json={"sessionId": session_id, "message": message}).get_json()
+    assert body['status'] == 'completed'
+    # The re-score runs on the single background worker - wait for it
+    routes.BACKGROUND.submit(lambda: None).result()
+
+    avatars = client.get('/api/recruiter/avatars/j2').get_json()['avatars']
+    listed = {a['candidateId']: a['matchScore'] for a in avatars}
+    scores = client.post('/api/recruiter/scores', json={"jobIds": ['j2'], "candidateIds": ['c1']}).get_json()
+    assert listed['c1'] == 1.0
+    assert scores['candidates'][0]['scores'][0]['matchScore'] == 1.0
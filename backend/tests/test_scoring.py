@@ -0,0 +1,40 @@
+import pytest
+
+import scoring
+from candidates import CompactCandidate
+from models import Job, JobSkill
+from scoring import calculate_build, score_against
+
+
+def _job():
+    job = Job(job_id='parity', title='Data Engineer')
+    job.skills_required = [
+        JobSkill(skill_id='sk_python', name='Python', importance='critical'),
+        JobSkill(skill_id='sk_sql', name='SQL', importance='high'),
+        JobSkill(skill_id='sk_excel', name='Excel', importance='medium'),
+    ]
+    return job
+
+def _skill(skill_id, name):
+    return {"id": skill_id, "name": name, "level": "advanced", "category": "Code"}
+
+@pytest.mark.parametrize('skills', [
+    pytest.param([_skill('sk_python', 'Py3'), _skill('sk_sql', 'Structured Query')], id='id-only'),
+    pytest.param([_skill('s1', 'python'), _skill('s2', 'EXCEL')], id='name-only'),
+    pytest.param([_skill('sk_python', 'Py3'), _skill('s2', 'sql'), _skill('s3', 'Word')], id='id-and-name'),
+    # A candidate name equal to a job skill id (and vice versa) is not a match
+    pytest.param([_skill('python', 'sk_sql'), _skill('excel', 'sk_python')], id='cross-key-space'),
+    pytest.param([], id='no-skills'),
+])
+def test_score_against_matches_calculate_build(skills):
+    scoring._drop_local()
+    job = _job()
+    build = calculate_build({"skills": skills}, job)
+    score = score_against(CompactCandidate('c1', 'Code Wizard', skills), scoring.get_compiled_job(job))
+
+    assert score == {
+        "matchScore": build['matchScore'],
+        "gapCostHours": build['gapCostHours'],
+        "criticalCovered": build['skillCoverage']['criticalCovered'],
+        "overallCovered": build['skillCoverage']['overallCovered'],
+    }
@@ -0,0 +1,57 @@
+import pytest
+
+from serialization import choose_encoding, parse_fields, project
+from conftest import add_job, add_profile
+
+
+def test_parse_fields():
+    assert parse_fields('a, b,-c') == ({'a', 'b'}, {'c'})
+    assert parse_fields(None) == (None, set())
+
+def test_project_keeps_fields_of_list_items():
+    payload = [{"jobId": 'j1', "title": 'A', "description": 'long'}]
+    assert project(payload, 'jobId,title') == [{"jobId": 'j1', "title": 'A'}]
+
+def test_project_keeps_fields_of_nested_records():
+    payload = {"jobId": 'j1', "avatars": [{"avatarId": 'a', "matchScore": 0.5, "summary": 's'}]}
+    assert project(payload, 'avatarId,matchScore', records='avatars') == {
+        "jobId": 'j1', "avatars": [{"avatarId": 'a', "matchScore": 0.5}]
+    }
+
+def test_project_dict_without_records_is_the_record():
+    assert project({"a": 1, "b": 2}, 'a') == {"a": 1}
+
+def test_project_drops_excluded_keys_at_any_depth():
+    payload = {"baseProfile": {}, "builds": [{"jobId": 'j1', "evidence": ['x'], "nested": {"evidence": 1}}]}
+    assert project(payload, '-baseProfile,-evidence') == {"builds": [{"jobId": 'j1', "nested": {}}]}
+
+def test_project_combines_inclusion_and_exclusion():
+    payload = {"candidateId": 'c1', "baseProfile": {}, "builds": [{"jobId": 'j1', "matchScore": 1, "quests": []}]}
+    assert project(payload, 'jobId,matchScore,-baseProfile', records='builds') == {
+        "candidateId": 'c1', "builds": [{"jobId": 'j1', "matchScore": 1}]
+    }
+
+def test_project_without_fields_is_a_no_op():
+    payload = {"a": [{"b": 1}]}
+    assert project(payload, None, records='a') is payload
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip, deflate', 'gzip'),
+    ('gzip;q=0', None),
+    ('', None),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header) == expected
+
+
+def test_avatars_endpoint_projects_each_avatar(client):
+    add_job('j1', [('python', 'Python', 'critical')])
+    add_profile('c1', [('python', 'Python')])
+    body = client.get('/api/recruiter/avatars/j1?fields=avatarId,matchScore').get_json()
+    assert body == {"jobId": 'j1', "avatars": [{"avatarId": 'c1:j1', "matchScore": 1.0}]}
+
+def test_builds_endpoint_projects_each_build(client):
+    add_job('j1', [('python', 'Python', 'critical')])
+    add_profile('c1', [('python', 'Python')])
+    body = client.post('/api/candidate/builds?fields=jobId,matchScore,-baseProfile', json={"candidateId": 'c1'}).get_json()
+    assert body == {"candidateId": 'c1', "builds": [{"jobId": 'j1', "matchScore": 1.0}]}
@@ -0,0 +1,11 @@
+import pytest
+
+import check_startup
+
+
+# routes is what every worker imports; models is all the seeder needs
+@pytest.mark.parametrize('module', ['models', 'routes', 'app'])
+def test_import_within_budget_without_lazy_modules(module):
+    seconds, eager = check_startup.measure(module)
+    assert eager == []
+    assert seconds <= check_startup.IMPORT_BUDGET
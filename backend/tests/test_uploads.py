@@ -0,0 +1,56 @@
+import threading
+import time
+
+import pytest
+
+import routes
+
+
+ANALYSIS = {
+    "skills": [{"id": "python", "name": "Python", "level": "advanced", "category": "Code"}],
+    "creativityScore": 0.5, "rpgClass": "Code Wizard", "metaSkills": []
+}
+
+@pytest.fixture
+def analyze_calls(monkeypatch):
+    calls = []
+    def analyze_cv(text):
+        calls.append(text)
+        time.sleep(0.2) # long enough for a double-click to arrive mid-analysis
+        return ANALYSIS
+    monkeypatch.setattr(routes.AIService, 'analyze_cv', analyze_cv)
+    return calls
+
+def parse(app, text, key=None):
+    headers = {'Idempotency-Key': key} if key else {}
+    return app.test_client().post('/api/candidate/parse', json={"cvText": text}, headers=headers).get_json()
+
+
+def test_double_submit_creates_one_profile(app, analyze_calls):
+    results = []
+    def submit():
+        with app.app_context():
+            results.append(parse(app, 'python dev', key='k1'))
+
+    threads = [threading.Thread(target=submit) for _ in range(2)]
+    threads[0].start()
+    time.sleep(0.05)
+    threads[1].start()
+    for thread in threads:
+        thread.join()
+
+    assert len(analyze_calls) == 1
+    assert results[0]['candidateId'] == results[1]['candidateId']
+
+def test_resubmit_with_same_key_returns_same_profile(app, analyze_calls):
+    first = parse(app, 'python dev', key='k1')
+    again = parse(app, 'python dev', key='k1')
+    assert again['candidateId'] == first['candidateId']
+    assert len(analyze_calls) == 1
+
+def test_anonymous_uploads_with_same_content_stay_separate(app, analyze_calls):
+    # Two people (two clients, two keys) sending the same CV
+    first = parse(app, 'python dev', key='client-a')
+    second = parse(app, 'python dev', key='client-b')
+    assert first['candidateId'] != second['candidateId']
+    assert len(analyze_calls) == 2
@@ -0,0 +1,130 @@
+"""Deduplication and idempotency for /api/candidate/parse.
+
+An upload is identified by its Idempotency-Key header (if sent) and, for logged-in users,
+by a hash of its content (file bytes or CV text, LinkedIn URL, domain-change flag) scoped
+to the user. Anonymous uploads are only matched by Idempotency-Key, so two people sending
+the same CV never share a profile (or its assessment sessions).
+
+The keys map to the candidateId and content hash of the upload, in the shared cache. Each
+profile records the hash of the upload it was last built from; a mapping only counts while
+the two agree, so after an in-place update (or any other change to the profile) earlier
+uploads are analyzed again instead of returning the profile's current contents.
+Concurrent duplicates within a process wait for the first request instead of running
+a second PDF parse and LLM call.
+"""
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import Future
+
+from cache import get_cache
+from profiles import load_candidate_profile, profile_source, set_profile_source
+
+UPLOAD_TTL = 7 * 24 * 3600
+# How long a duplicate waits for the in-flight request it joined
+IN_FLIGHT_TIMEOUT = 180
+
+PARSE_RESPONSE_FIELDS = ("candidateId", "summary", "skills", "metaSkills", "creativityScore", "rpgClass")
+
+# content key -> Future of the parse response
+_IN_FLIGHT = {}
+_in_flight_guard = threading.Lock()
+
+
+class UploadError(Exception):
+    """A parse failure that maps to an error response (shared with coalesced duplicates)"""
+
+    def __init__(self, body, status):
+        super().__init__(body.get('error'))
+        self.body = body
+        self.status = status
+
+
+def upload_keys(user_public_id, idempotency_key, content, linkedin_url, wants_domain_change):
+    """(cache keys identifying an upload, content hash).
+
+    Keys are [idempotency key,] [content key (logged-in users only)] - possibly none at all
+    for an anonymous upload without an Idempotency-Key, which is then never deduplicated.
+    """
+    cache = get_cache()
+    scope = user_public_id or 'anonymous'
+    digest = hashlib.sha256()
+    digest.update(content if isinstance(content, bytes) else (content or '').encode('utf-8'))
+    digest.update(f"\0{linkedin_url or ''}\0{bool(wants_domain_change)}".encode('utf-8'))
+    content_hash = digest.hexdigest()
+    keys = []
+    if idempotency_key:
+        keys.append(cache.key('uploads', scope, 'idempotency', idempotency_key))
+    if user_public_id:
+        keys.append(cache.key('uploads', scope, 'content', content_hash))
+    return keys, content_hash
+
+def previous_upload(keys):
+    """Parse response of an earlier identical upload, or None. Needs an app context."""
+    cache = get_cache()
+    for key in keys:
+        upload = cache.get(key)
+        if upload is None:
+            continue
+        # The profile has been rebuilt from other content (or changed) since
+        if profile_source(upload['candidateId']) != upload['contentHash']:
+            continue
+        profile = load_candidate_profile(upload['candidateId'])
+        if profile:
+            return {field: profile[field] for field in PARSE_RESPONSE_FIELDS}
+    return None
+
+def remember_upload(keys, content_hash, candidate_id):
+    """Record the upload a profile was just built from. Call after the profile is committed."""
+    cache = get_cache()
+    set_profile_source(candidate_id, content_hash, UPLOAD_TTL)
+    for key in keys:
+        cache.set(key, {"candidateId": candidate_id, "contentHash": content_hash}, UPLOAD_TTL)
+
+
+def _claim(key):
+    """(future, True) for the first request on key, (its future, False) for duplicates"""
+    with _in_flight_guard:
+        future = _IN_FLIGHT.get(key)
+        if future is not None:
+            return future, False
+        future = _IN_FLIGHT[key] = Future()
+        return future, True
+
+def _finish(key, future, result=None, error=None):
+    with _in_flight_guard:
+        _IN_FLIGHT.pop(key, None)
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+def coalesce(keys, run):
+    """Run run() once for concurrent identical uploads; duplicates get the same result"""
+    if not keys:
+        return run()
+    future, leader = _claim(keys[-1])
+    if not leader:
+        return future.result(timeout=IN_FLIGHT_TIMEOUT)
+    try:
+        result = run()
+    except Exception as e:
+        _finish(keys[-1], future, error=e)
+        raise
+    _finish(keys[-1], future, result=result)
+    return result
+
+async def coalesce_async(keys, run):
+    """coalesce() for a coroutine function; joins uploads in flight on any thread"""
+    if not keys:
+        return await run()
+    future, leader = _claim(keys[-1])
+    if not leader:
+        return await asyncio.wait_for(asyncio.wrap_future(future), IN_FLIGHT_TIMEOUT)
+    try:
+        result = await run()
+    except BaseException as e:
+        _finish(keys[-1], future, error=e if isinstance(e, Exception) else UploadError({"error": "Upload cancelled"}, 500))
+        raise
+    _finish(keys[-1], future, result=result)
+    return result
@@ -0,0 +1,10 @@
+"""WSGI entrypoint, e.g.  gunicorn wsgi:app"""
+from app import create_app, init_db
+from maintenance import start_maintenance_worker
+from scoring import compile_jobs
+
+app = create_app()
+init_db(app)
+with app.app_context():
+    compile_jobs()
+start_maintenance_worker(app)
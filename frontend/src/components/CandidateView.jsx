@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useRef, useState } from 'react';
 import CandidateInputForm from './CandidateInputForm';
 import BuildSelector from './BuildSelector';
 import RPGSkillTree from './RPGSkillTree';
@@ -14,11 +14,21 @@ function CandidateView() {
     const [loading, setLoading] = useState(false);
     const [filter, setFilter] = useState('all'); // all, high_match, medium_match
     const [assessmentMode, setAssessmentMode] = useState(false);
+    // Idempotency-Key of the current form input, reused until the input changes
+    const parseKey = useRef({ input: null, key: null });
 
     const handleParse = async (cvText, file, currentDomain, targetDomains, wantsDomainChange) => {
         setLoading(true);
         try {
             // 1. Parse CV (Handle File)
+            // Double-clicks and resubmits of the same input reuse one key, so the backend creates one profile
+            const input = JSON.stringify([
+                cvText, file && [file.name, file.size, file.lastModified], currentDomain, targetDomains, wantsDomainChange
+            ]);
+            if (parseKey.current.input !== input) {
+                parseKey.current = { input, key: crypto.randomUUID() };
+            }
+            const idempotencyKey = parseKey.current.key;
             let profile;
             if (file) {
                 const formData = new FormData();
@@ -28,13 +38,14 @@ function CandidateView() {
 
                 const parseRes = await fetch('http://localhost:5000/api/candidate/parse', {
                     method: 'POST',
+                    headers: { 'Idempotency-Key': idempotencyKey },
                     body: formData,
                 });
                 profile = await parseRes.json();
             } else {
                 const parseRes = await fetch('http://localhost:5000/api/candidate/parse', {
                     method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
+                    headers: { 'Content-Type': 'application/json', 'Idempotency-Key': idempotencyKey },
                     body: JSON.stringify({ cvText, currentDomain, targetDomains, wantsDomainChange })
                 });
                 profile = await parseRes.json();
@@ -61,10 +72,10 @@ function CandidateView() {
 
         try {
             // 2. Generate Builds (Now with refined profile)
-            const buildsRes = await fetch('http://localhost:5000/api/candidate/builds', {
+            const buildsRes = await fetch('http://localhost:5000/api/candidate/builds?fields=-baseProfile', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ candidateProfile: updatedProfile })
+                body: JSON.stringify({ candidateId: updatedProfile.candidateId })
             });
             const buildsData = await buildsRes.json();
 